@@ -3,7 +3,8 @@ import os
 from datetime import datetime
 from core.ai_client import AIClient
 from core.scrum_manager import ScrumManager
-from core.data_store import DataStore
+from core.data_store import create_data_store
+from core.burndown import snapshot_burndown
 from assets.cyber_styles import apply_cyber_theme
 import time
 
@@ -24,8 +25,9 @@ apply_cyber_theme()
 if 'initialized' not in st.session_state:
     st.session_state.initialized = True
     st.session_state.ai_client = AIClient()
-    st.session_state.scrum_manager = ScrumManager()
-    st.session_state.data_store = DataStore()
+    st.session_state.data_store = create_data_store()
+    st.session_state.scrum_manager = ScrumManager(st.session_state.data_store)
+    snapshot_burndown(st.session_state.data_store)
 
 def main():
     # Header with cyberpunk styling
@@ -58,6 +60,13 @@ def main():
         </div>
         """, unsafe_allow_html=True)
         
+        if not connection_status:
+            health = st.session_state.ai_client.health.status()
+            if health['error']:
+                st.caption(f"Connection failed: {health['error']}")
+            if st.button("🔄 Retry Connection"):
+                st.session_state.ai_client.health.refresh()
+        
         # Navigation menu
         page = st.selectbox(
             "SELECT MODULE",
@@ -141,12 +150,13 @@ def show_dashboard():
     
     with col3:
         st.markdown("### 🎯 QUICK ACTIONS")
+        # Cached AI answers are reused until the stories or sprints change
+        use_cache = not st.checkbox("Fresh AI answers (skip cache)", key="ai_skip_cache")
         if st.button("🤖 AI Sprint Analysis", use_container_width=True):
-            with st.spinner("Analyzing sprint data..."):
-                analysis = st.session_state.ai_client.analyze_sprint_health()
-                if analysis:
-                    st.success("Analysis complete!")
-                    st.write(analysis)
+            # Tokens are shown as the model produces them instead of after the whole answer
+            analysis = st.write_stream(st.session_state.ai_client.stream_sprint_health(use_cache=use_cache))
+            if analysis:
+                st.success("Analysis complete!")
         
         if st.button("📝 Generate Standup", use_container_width=True):
             with st.spinner("Generating standup summary..."):
@@ -173,14 +183,14 @@ def show_dashboard():
     with col1:
         if st.button("🔮 Team Velocity Prediction"):
             with st.spinner("Calculating velocity trends..."):
-                prediction = st.session_state.ai_client.predict_velocity()
+                prediction = st.session_state.ai_client.predict_velocity(use_cache=use_cache)
                 if prediction:
                     st.write(prediction)
     
     with col2:
         if st.button("⚡ Bottleneck Detection"):
             with st.spinner("Scanning for bottlenecks..."):
-                bottlenecks = st.session_state.ai_client.detect_bottlenecks()
+                bottlenecks = st.session_state.ai_client.detect_bottlenecks(use_cache=use_cache)
                 if bottlenecks:
                     st.write(bottlenecks)
 
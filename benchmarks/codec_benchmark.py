@@ -0,0 +1,88 @@
+"""Compare DataStore codecs on load and save time.
+
+Run from the repository root:
+
+    python -m benchmarks.codec_benchmark [--sizes 1000 10000 100000] [--repeat 3]
+
+Each codec that is installed encodes a synthetic story list, writes it with
+the same atomic write the DataStore uses, then reads and decodes it back.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Dict, List
+
+from core.serializers import available_codecs
+from utils.helpers import atomic_write_bytes
+
+STATUSES = ["Backlog", "To Do", "In Progress", "Review", "Done"]
+PRIORITIES = ["Low", "Medium", "High", "Critical"]
+LABELS = ["frontend", "backend", "api", "blocked", "tech-debt", "ux"]
+
+
+def make_stories(count: int, seed: int = 42) -> List[Dict]:
+    """Build ``count`` stories shaped like the ones the app stores"""
+    rng = random.Random(seed)
+    stories = []
+    for i in range(count):
+        stories.append({
+            "id": f"{i:08x}-0000-4000-8000-{rng.getrandbits(48):012x}",
+            "title": f"Story {i}: improve workflow step {rng.randint(1, 500)}",
+            "description": "As a user I want the thing to work so that I can get on with my day. " * 2,
+            "acceptance_criteria": ["Given a state", "When an action happens", "Then it works"],
+            "story_points": rng.choice([1, 2, 3, 5, 8, 13]),
+            "priority": rng.choice(PRIORITIES),
+            "status": rng.choice(STATUSES),
+            "assignee": f"dev{rng.randint(1, 12)}",
+            "labels": rng.sample(LABELS, rng.randint(0, 3)),
+            "created_at": "2024-01-15T09:30:00.000000",
+            "updated_at": "2024-02-01T17:45:12.000000",
+            "version": rng.randint(1, 9)
+        })
+    return stories
+
+
+def time_codec(codec, stories: List[Dict], path: str, repeat: int) -> Dict:
+    """Best-of-``repeat`` save and load times in milliseconds, plus file size"""
+    save_times, load_times = [], []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        atomic_write_bytes(path, codec.encode(stories), fsync=False)
+        save_times.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        with open(path, 'rb') as f:
+            codec.decode(f.read())
+        load_times.append(time.perf_counter() - started)
+
+    return {
+        "save_ms": min(save_times) * 1000,
+        "load_ms": min(load_times) * 1000,
+        "size_kb": os.path.getsize(path) / 1024
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark DataStore codecs")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    codecs = available_codecs()
+    print(f"Codecs: {', '.join(codecs)}")
+    print(f"{'stories':>8} {'codec':>8} {'save ms':>10} {'load ms':>10} {'size KB':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "stories.json")
+        for size in args.sizes:
+            stories = make_stories(size)
+            for name, codec in codecs.items():
+                result = time_codec(codec, stories, path, args.repeat)
+                print(f"{size:>8} {name:>8} {result['save_ms']:>10.1f} "
+                      f"{result['load_ms']:>10.1f} {result['size_kb']:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
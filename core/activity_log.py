@@ -0,0 +1,91 @@
+import json
+import os
+from typing import Dict, List
+
+from core.file_lock import file_lock
+from utils.helpers import atomic_write_bytes
+
+# Entries kept after compaction, matching the old activities.json cap
+MAX_ACTIVITIES = 100
+
+# Compact once the log grows past this many bytes (a few hundred entries)
+COMPACT_BYTES = 64 * 1024
+
+# Block size used when scanning backwards from the end of the file
+TAIL_BLOCK_SIZE = 8192
+
+
+class ActivityLog:
+    """Append-only JSONL activity log with bounded ring semantics.
+
+    Each activity is one appended line, oldest first. When the file grows
+    past ``compact_bytes`` it is rewritten to the newest ``max_entries``
+    lines, so readers only ever need the tail of the file.
+    """
+
+    def __init__(self, file_path: str, max_entries: int = MAX_ACTIVITIES,
+                 compact_bytes: int = COMPACT_BYTES):
+        self.file_path = file_path
+        self.max_entries = max_entries
+        self.compact_bytes = compact_bytes
+
+    def append(self, activity: Dict):
+        """Append one activity and compact the log if it has grown too large"""
+        self.extend([activity])
+
+    def extend(self, activities: List[Dict]):
+        """Append several activities (oldest first) in a single write"""
+        if not activities:
+            return
+        payload = "".join(json.dumps(a, ensure_ascii=False) + "\n" for a in activities)
+        # Appends share the compaction lock so none land in a replaced file
+        with file_lock(self.file_path):
+            with open(self.file_path, 'a', encoding='utf-8') as f:
+                f.write(payload)
+                size = f.tell()
+            if size > self.compact_bytes:
+                self._compact()
+
+    def recent(self, limit: int = 10) -> List[Dict]:
+        """Get the newest ``limit`` activities, newest first"""
+        if limit <= 0 or not os.path.exists(self.file_path):
+            return []
+
+        activities = []
+        # One spare line covers a torn final line from an interrupted append
+        for line in reversed(self._tail_lines(limit + 1)):
+            try:
+                activities.append(json.loads(line))
+            except ValueError:
+                continue
+        return activities[:limit]
+
+    def _tail_lines(self, count: int) -> List[bytes]:
+        """Read the last ``count`` complete lines by seeking backwards from EOF"""
+        with open(self.file_path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            position = f.tell()
+            buffer = b""
+            # One extra newline guarantees the first kept line is complete
+            while position > 0 and buffer.count(b"\n") <= count:
+                read_size = min(TAIL_BLOCK_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                buffer = f.read(read_size) + buffer
+
+        lines = [line for line in buffer.split(b"\n") if line.strip()]
+        if position > 0:
+            # The first piece may be the cut-off end of an older line
+            lines = lines[1:]
+        return lines[-count:]
+
+    def _compact(self):
+        """Rewrite the log keeping only the newest ``max_entries`` lines"""
+        lines = self._tail_lines(self.max_entries)
+        atomic_write_bytes(self.file_path, b"".join(line + b"\n" for line in lines))
+
+    def import_legacy(self, activities: List[Dict]):
+        """Seed an empty log from the old newest-first activities.json list"""
+        if os.path.exists(self.file_path):
+            return
+        self.extend(list(reversed(activities[:self.max_entries])))
@@ -2,10 +2,45 @@ import requests
 import json
 import streamlit as st
 import os
-from typing import Dict, List, Optional
+import threading
+from typing import Dict, Iterator, List, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from core.health_monitor import get_health_monitor
+from core.response_cache import get_response_cache, make_key
+from core.stream_filter import clean_response, filter_stream
 from utils.prompts import SCRUM_PROMPTS
 import time
 
+# Connection pool for the LM Studio host, shared by every Streamlit session
+POOL_CONNECTIONS = 4
+POOL_MAXSIZE = 16
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_shared_session() -> requests.Session:
+    """Get the process-wide HTTP session, creating it on first use.
+
+    Connections are kept alive and reused across AI calls, health checks
+    and reruns instead of being opened per request.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            # Retry only failed connects: the request was never sent, so it is safe for POST
+            retries = Retry(total=1, connect=1, read=0, status=0, redirect=0, backoff_factor=0.1)
+            adapter = HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                                  max_retries=retries)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"Content-Type": "application/json"})
+            _session = session
+        return _session
+
+
 class AIClient:
     """Client for communicating with local Qwen3 4B model via LM Studio"""
     
@@ -15,48 +50,133 @@ class AIClient:
         self.model_name = os.getenv("MODEL_NAME", "qwen2.5-3b-instruct")
         self.max_tokens = 2048
         self.temperature = 0.7
+        self.session = get_shared_session()
+        self.health = get_health_monitor(f"{self.base_url}/v1/models", self.session)
+        self.cache = get_response_cache()
         
     def check_connection(self) -> bool:
-        """Check if LM Studio is available"""
-        try:
-            response = requests.get(f"{self.base_url}/v1/models", timeout=5)
-            return response.status_code == 200
-        except Exception as e:
-            st.error(f"Connection failed: {str(e)}")
-            return False
+        """Check if LM Studio is available, from the background health probe"""
+        return self.health.is_online()
+    
+    def _data_version(self) -> str:
+        """Version of the stored stories and sprints that prompts are built from"""
+        data_store = st.session_state.get('data_store')
+        return data_store.get_data_version() if data_store is not None else ""
+    
+    def clear_cache(self):
+        """Drop every cached AI response"""
+        self.cache.clear()
     
-    def _make_request(self, messages: List[Dict], temperature: float = None) -> Optional[str]:
-        """Make a request to the local AI model"""
+    def _make_request(self, messages: List[Dict], temperature: float = None,
+                      use_cache: bool = True) -> Optional[str]:
+        """Make a request to the local AI model.
+
+        Responses are cached by model, messages, temperature, max_tokens and
+        the data version, so a data change retires them. ``use_cache=False``
+        always asks the model (and refreshes the cached answer).
+        """
+        temperature = temperature or self.temperature
+        cache_key = make_key(self.model_name, messages, temperature, self.max_tokens, self._data_version())
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return cached
+        
         try:
             payload = {
                 "model": self.model_name,
                 "messages": messages,
                 "max_tokens": self.max_tokens,
-                "temperature": temperature or self.temperature,
+                "temperature": temperature,
                 "stream": False
             }
             
-            response = requests.post(
+            response = self.session.post(
                 self.api_endpoint,
                 json=payload,
-                timeout=120,
-                headers={"Content-Type": "application/json"}
+                timeout=120
             )
             
             if response.status_code == 200:
+                self.health.report(True)
                 result = response.json()
                 content = result['choices'][0]['message']['content']
                 # Clean up thinking content
                 cleaned_content = self._clean_thinking_content(content)
+                self.cache.put(cache_key, cleaned_content)
                 return cleaned_content
             else:
                 st.error(f"AI request failed: {response.status_code}")
                 return None
                 
+        except requests.ConnectionError as e:
+            self.health.report(False, str(e))
+            st.error(f"AI communication error: {str(e)}")
+            return None
         except Exception as e:
             st.error(f"AI communication error: {str(e)}")
             return None
     
+    def _stream_request(self, messages: List[Dict], temperature: float = None,
+                        use_cache: bool = True) -> Iterator[str]:
+        """Stream a response from the local AI model as cleaned text chunks.
+
+        Reads the server-sent events of a ``"stream": true`` completion and
+        yields visible text as it arrives, for ``st.write_stream``. Thinking
+        blocks are dropped on the fly. A cached answer is yielded whole, and
+        a completed stream is cached like ``_make_request`` would.
+        """
+        temperature = temperature or self.temperature
+        cache_key = make_key(self.model_name, messages, temperature, self.max_tokens, self._data_version())
+        if use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
+        
+        payload = {
+            "model": self.model_name,
+            "messages": messages,
+            "max_tokens": self.max_tokens,
+            "temperature": temperature,
+            "stream": True
+        }
+        shown = []
+        try:
+            with self.session.post(self.api_endpoint, json=payload, stream=True, timeout=(5, 120)) as response:
+                if response.status_code != 200:
+                    st.error(f"AI request failed: {response.status_code}")
+                    return
+                self.health.report(True)
+                
+                for visible in filter_stream(self._read_deltas(response)):
+                    shown.append(visible)
+                    yield visible
+            
+            if shown:
+                self.cache.put(cache_key, "".join(shown))
+                
+        except requests.ConnectionError as e:
+            self.health.report(False, str(e))
+            st.error(f"AI communication error: {str(e)}")
+        except Exception as e:
+            st.error(f"AI communication error: {str(e)}")
+    
+    def _read_deltas(self, response: requests.Response) -> Iterator[str]:
+        """Yield the content deltas of a streamed completion's server-sent events"""
+        # chunk_size=None hands over each chunk as it arrives instead of filling a buffer first
+        for line in response.iter_lines(chunk_size=None):
+            # SSE frames are "data: {...}" lines, ended by "data: [DONE]"
+            if not line.startswith(b"data:"):
+                continue
+            data = line[5:].strip()
+            if data == b"[DONE]":
+                break
+            choices = json.loads(data).get('choices') or [{}]
+            delta = choices[0].get('delta', {}).get('content')
+            if delta:
+                yield delta
+    
     def estimate_story_points(self, story_title: str, description: str, acceptance_criteria: str) -> Optional[Dict]:
         """Estimate story points using AI analysis"""
         messages = [
@@ -117,16 +237,21 @@ class AIClient:
         
         return self._make_request(messages)
     
-    def analyze_sprint_health(self) -> Optional[str]:
-        """Analyze current sprint health and provide insights"""
+    def _sprint_health_messages(self) -> List[Dict]:
         sprint_data = st.session_state.data_store.get_current_sprint_data()
         
-        messages = [
+        return [
             {"role": "system", "content": SCRUM_PROMPTS["sprint_analysis"]},
             {"role": "user", "content": f"Sprint Data: {json.dumps(sprint_data, indent=2)}"}
         ]
-        
-        return self._make_request(messages)
+    
+    def analyze_sprint_health(self, use_cache: bool = True) -> Optional[str]:
+        """Analyze current sprint health and provide insights"""
+        return self._make_request(self._sprint_health_messages(), use_cache=use_cache)
+    
+    def stream_sprint_health(self, use_cache: bool = True) -> Iterator[str]:
+        """Analyze current sprint health, yielding the insights as they are generated"""
+        return self._stream_request(self._sprint_health_messages(), use_cache=use_cache)
     
     def generate_retrospective_insights(self, retrospective_data: Dict) -> Optional[str]:
         """Generate retrospective insights and action items"""
@@ -137,7 +262,7 @@ class AIClient:
         
         return self._make_request(messages)
     
-    def predict_velocity(self) -> Optional[str]:
+    def predict_velocity(self, use_cache: bool = True) -> Optional[str]:
         """Predict team velocity based on historical data"""
         velocity_data = st.session_state.data_store.get_velocity_history()
         
@@ -146,9 +271,9 @@ class AIClient:
             {"role": "user", "content": f"Historical Velocity Data: {json.dumps(velocity_data, indent=2)}"}
         ]
         
-        return self._make_request(messages)
+        return self._make_request(messages, use_cache=use_cache)
     
-    def detect_bottlenecks(self) -> Optional[str]:
+    def detect_bottlenecks(self, use_cache: bool = True) -> Optional[str]:
         """Detect potential bottlenecks in the workflow"""
         workflow_data = st.session_state.data_store.get_workflow_data()
         
@@ -157,7 +282,7 @@ class AIClient:
             {"role": "user", "content": f"Workflow Data: {json.dumps(workflow_data, indent=2)}"}
         ]
         
-        return self._make_request(messages)
+        return self._make_request(messages, use_cache=use_cache)
     
     def generate_sprint_plan(self, backlog_items: List[Dict], team_capacity: int) -> Optional[str]:
         """Generate optimal sprint plan based on backlog and capacity"""
@@ -175,31 +300,7 @@ class AIClient:
     
     def _clean_thinking_content(self, content: str) -> str:
         """Remove thinking content from AI responses"""
-        # Remove <think>...</think> blocks
-        import re
-        
-        # Remove thinking blocks
-        content = re.sub(r'<think>.*?</think>', '', content, flags=re.DOTALL)
-        
-        # Remove thinking patterns
-        thinking_patterns = [
-            r'<think>.*?</think>',
-            r'Let me think about this.*?(?=\n\n|\n[A-Z]|$)',
-            r'Okay, let\'s tackle this.*?(?=\n\n|\n[A-Z]|$)',
-            r'I need to analyze.*?(?=\n\n|\n[A-Z]|$)',
-            r'First, I\'ll.*?(?=\n\n|\n[A-Z]|$)',
-            r'Let me structure.*?(?=\n\n|\n[A-Z]|$)',
-            r'Wait,.*?(?=\n\n|\n[A-Z]|$)',
-        ]
-        
-        for pattern in thinking_patterns:
-            content = re.sub(pattern, '', content, flags=re.DOTALL | re.IGNORECASE)
-        
-        # Clean up extra whitespace
-        content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
-        content = content.strip()
-        
-        return content
+        return clean_response(content)
 
     def _extract_complexity_factors(self, response: str) -> List[str]:
         """Extract complexity factors from AI response"""
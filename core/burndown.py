@@ -0,0 +1,103 @@
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
+
+from core.file_lock import file_lock
+
+
+def _sprint_dates(sprint: Dict):
+    start = datetime.strptime(sprint['start_date'], "%Y-%m-%d").date()
+    end = datetime.strptime(sprint['end_date'], "%Y-%m-%d").date()
+    return start, end
+
+
+def _remaining_now(sprint: Dict) -> float:
+    return max(0, sprint.get('total_points', 0) - sprint.get('completed_points', 0))
+
+
+def _set_day(remaining: List[float], day: int, value: float):
+    """Set ``remaining[day]``, carrying the last value over any missed days"""
+    while len(remaining) < day:
+        remaining.append(remaining[-1] if remaining else value)
+    if len(remaining) == day:
+        remaining.append(value)
+    else:
+        remaining[day] = value
+
+
+def _load_series(data_store) -> Dict:
+    series = data_store._load_json(data_store.burndown_file, None)
+    return series if isinstance(series, dict) else {}
+
+
+def snapshot_burndown(data_store, today: date = None) -> int:
+    """Record today's remaining points for every running sprint.
+
+    Each sprint keeps one value per sprint day in data/burndown.json.
+    The value comes from the sprint's own point counters, so a snapshot
+    costs O(1) per sprint however many stories there are. A sprint seen
+    for the first time is backfilled from its recorded status changes.
+    Returns the number of sprints recorded.
+    """
+    today = today or date.today()
+    with file_lock(data_store.burndown_file):
+        # Copy so the cached document only changes once the write succeeds
+        series = dict(_load_series(data_store))
+        recorded = 0
+
+        for sprint in data_store.get_all_sprints():
+            if sprint.get('status') == 'Completed':
+                continue
+            start, end = _sprint_dates(sprint)
+            if not start <= today <= end:
+                continue
+
+            entry = series.get(sprint['id'])
+            if not entry or entry.get('start_date') != sprint['start_date']:
+                history = data_store.get_burndown_history(sprint['id'])
+                entry = {
+                    "start_date": sprint['start_date'],
+                    "remaining": [point['actual_remaining'] for point in history]
+                }
+            else:
+                entry = {"start_date": entry['start_date'], "remaining": list(entry['remaining'])}
+
+            _set_day(entry['remaining'], (today - start).days, _remaining_now(sprint))
+            series[sprint['id']] = entry
+            recorded += 1
+
+        if recorded:
+            data_store._save_json(data_store.burndown_file, series)
+        return recorded
+
+
+def get_burndown_series(data_store, sprint: Dict, today: date = None) -> Optional[List[Dict]]:
+    """Get a sprint's actual burndown line from its snapshots.
+
+    Today's point is taken from the live sprint counters, so the line is
+    current between snapshots. Returns None if the sprint has no series.
+    """
+    entry = _load_series(data_store).get(sprint['id'])
+    if not entry or entry.get('start_date') != sprint['start_date']:
+        return None
+
+    today = today or date.today()
+    start, end = _sprint_dates(sprint)
+    remaining = list(entry['remaining'])
+    if start <= today <= end:
+        _set_day(remaining, (today - start).days, _remaining_now(sprint))
+
+    return [
+        {
+            "day": i,
+            "actual_remaining": round(value, 1),
+            "date": (start + timedelta(days=i)).strftime("%Y-%m-%d")
+        }
+        for i, value in enumerate(remaining)
+    ]
+
+
+if __name__ == "__main__":
+    from core.data_store import create_data_store
+
+    count = snapshot_burndown(create_data_store())
+    print(f"Recorded burndown snapshots for {count} sprint(s)")
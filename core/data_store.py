@@ -1,9 +1,194 @@
+import copy
 import json
 import os
+import threading
+from contextlib import ExitStack, contextmanager
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 import streamlit as st
 
+from core.activity_log import ActivityLog
+from core.dependency_graph import DependencyGraph
+from core.file_lock import file_lock, lock_stats
+from core.serializers import PrettyJsonCodec, decode_any, get_codec
+from core.story_events import StoryEventLog, make_status_event, status_projection
+from core.story_index import FilterValue, StoryIndex
+from utils.helpers import atomic_write_bytes
+
+
+class VersionConflictError(Exception):
+    """Raised when a record was changed by another writer since it was read"""
+    pass
+
+
+def _check_version(stored: Dict, record: Dict):
+    """Raise VersionConflictError if record was read before stored was saved"""
+    current_version = stored.get('version', 0)
+    expected_version = record.get('version')
+    if expected_version is not None and expected_version != current_version:
+        raise VersionConflictError(
+            f"{record['id']} was modified by another session "
+            f"(version {current_version}, expected {expected_version})"
+        )
+
+
+def _copy_record(record: Optional[Dict]) -> Optional[Dict]:
+    """Copy a cached record so in-place edits stay private until saved"""
+    # The cache is shared by every session, and any later write would persist the edit
+    return copy.deepcopy(record) if record is not None else None
+
+
+def _file_stamp(file_path: str) -> Optional[Tuple[int, int, int]]:
+    """Return the (mtime_ns, size, inode) stamp of a file, or None if missing"""
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    # Atomic replaces give every write a new inode, which catches rewrites
+    # that land within the filesystem's mtime granularity
+    return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def _build_id_index(records: List[Dict]) -> Dict[str, int]:
+    """Map each record id to its list position"""
+    index = {}
+    # Walk backwards so the first record wins on duplicate ids
+    for pos in range(len(records) - 1, -1, -1):
+        index[records[pos]['id']] = pos
+    return index
+
+
+def _stamp_list(file_path: str) -> Optional[List[int]]:
+    """File stamp in the list form it takes once stored as JSON"""
+    stamp = _file_stamp(file_path)
+    return list(stamp) if stamp is not None else None
+
+
+class DocumentCache:
+    """Process-wide cache of parsed JSON documents.
+
+    Entries are keyed by absolute path and stamped with the file's
+    (mtime_ns, size, inode), so a write from another process invalidates the
+    entry the next time it is looked up. Entries can also carry derived
+    indexes (id -> position, secondary story indexes) that live and die
+    with the cached document. Cached documents and indexes are never
+    changed in place: a write puts a new document with its own indexes,
+    so a reader holding the old one keeps a consistent snapshot.
+    """
+    
+    def __init__(self):
+        # path -> [stamp, data, {name: derived index}]
+        self._entries: Dict[str, List[Any]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, file_path: str, stamp: Tuple[int, int, int]) -> Tuple[bool, Any]:
+        """Return (found, data) for a path if the cached stamp still matches"""
+        key = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stamp:
+                self.hits += 1
+                return True, entry[1]
+            self.misses += 1
+            return False, None
+    
+    def put(self, file_path: str, stamp: Optional[Tuple[int, int, int]], data: Any,
+            derived: Optional[Dict[str, Any]] = None):
+        """Store parsed data for a path under the given stamp, with any indexes already built for it"""
+        key = os.path.abspath(file_path)
+        with self._lock:
+            if stamp is None:
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = [stamp, data, dict(derived or {})]
+    
+    def derived(self, file_path: str, records: Any, name: str, builder: Callable[[Any], Any]) -> Any:
+        """Get an index derived from a cached document, building it on first use.
+
+        Indexes for a document that is not (or no longer) cached are built
+        but not kept.
+        """
+        key = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] is not records:
+                return builder(records)
+            if name not in entry[2]:
+                entry[2][name] = builder(records)
+            return entry[2][name]
+    
+    def peek_derived(self, file_path: str, records: Any, name: str) -> Any:
+        """Get a derived index only if it has already been built"""
+        key = os.path.abspath(file_path)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] is not records:
+                return None
+            return entry[2].get(name)
+    
+    def id_index(self, file_path: str, records: List[Dict]) -> Dict[str, int]:
+        """Get the id -> list position index for a cached list document"""
+        return self.derived(file_path, records, "id", _build_id_index)
+    
+    def invalidate(self, file_path: Optional[str] = None):
+        """Drop one path, or every entry when no path is given"""
+        with self._lock:
+            if file_path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(os.path.abspath(file_path), None)
+    
+    def stats(self) -> Dict:
+        """Get hit/miss counters for the cache"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries)
+            }
+
+
+# Shared by every DataStore in the process so Streamlit sessions reuse parses
+_document_cache = DocumentCache()
+
+
+class StoreTransaction:
+    """Buffered story/sprint writes committed by ``DataStore.transaction()``.
+
+    Later writes to the same id replace earlier ones. Nothing is persisted
+    until the ``with`` block exits without an exception; afterwards
+    ``committed`` tells whether the write succeeded.
+    """
+    
+    def __init__(self):
+        self.stories: Dict[str, Dict] = {}
+        self.deleted_stories = set()
+        self.sprints: Dict[str, Dict] = {}
+        self.committed = False
+    
+    def save_story(self, story: Dict):
+        """Queue a story upsert"""
+        self.deleted_stories.discard(story['id'])
+        self.stories[story['id']] = story
+    
+    def delete_story(self, story_id: str):
+        """Queue a story deletion"""
+        self.stories.pop(story_id, None)
+        self.deleted_stories.add(story_id)
+    
+    def save_sprint(self, sprint: Dict):
+        """Queue a sprint upsert"""
+        self.sprints[sprint['id']] = sprint
+    
+    def is_empty(self) -> bool:
+        """Whether nothing has been queued"""
+        return not (self.stories or self.deleted_stories or self.sprints)
+
+
 class DataStore:
     """Simple file-based data storage for NeuralSprint"""
     
@@ -15,8 +200,18 @@ class DataStore:
         self.stories_file = os.path.join(self.data_dir, "stories.json")
         self.sprints_file = os.path.join(self.data_dir, "sprints.json")
         self.activities_file = os.path.join(self.data_dir, "activities.json")
+        self.activity_log = ActivityLog(os.path.join(self.data_dir, "activities.jsonl"))
+        self.story_events = StoryEventLog(os.path.join(self.data_dir, "story_events.jsonl"))
         self.team_file = os.path.join(self.data_dir, "team.json")
         self.settings_file = os.path.join(self.data_dir, "settings.json")
+        self.stats_file = os.path.join(self.data_dir, "stats.json")
+        self.burndown_file = os.path.join(self.data_dir, "burndown.json")
+        
+        # Encoding for data files; reads detect the format of each file
+        self.codec = get_codec()
+        
+        # Files that exist but failed to parse; saving over them would lose data
+        self._unreadable_files = set()
     
     def ensure_data_directory(self):
         """Create data directory if it doesn't exist"""
@@ -24,68 +219,247 @@ class DataStore:
             os.makedirs(self.data_dir)
     
     def _load_json(self, file_path: str, default: any = None) -> any:
-        """Load JSON data from file"""
+        """Load JSON data from file.
+
+        The parsed document is shared through the process-wide cache and
+        must not be changed in place; writes save a new document instead.
+        """
         try:
-            if os.path.exists(file_path):
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return default or []
+            stamp = _file_stamp(file_path)
+            if stamp is None:
+                return default or []
+            
+            found, data = _document_cache.get(file_path, stamp)
+            if found:
+                return data
+            
+            with open(file_path, 'rb') as f:
+                data = decode_any(f.read())
+            _document_cache.put(file_path, stamp, data)
+            self._unreadable_files.discard(file_path)
+            return data
         except Exception as e:
+            self._unreadable_files.add(file_path)
             st.error(f"Error loading {file_path}: {str(e)}")
             return default or []
     
-    def _save_json(self, file_path: str, data: any) -> bool:
-        """Save JSON data to file"""
+    def _save_json(self, file_path: str, data: any, derived: Optional[Dict[str, Any]] = None) -> bool:
+        """Save data to file atomically with the configured codec.
+
+        ``derived`` holds indexes already built for ``data``, which are
+        cached along with it.
+        """
+        if file_path in self._unreadable_files:
+            st.error(f"Refusing to overwrite {file_path}: it could not be read")
+            return False
+        
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            atomic_write_bytes(file_path, self.codec.encode(data))
+            # Our own write should not cost a re-parse on the next read
+            _document_cache.put(file_path, _file_stamp(file_path), data, derived)
             return True
         except Exception as e:
+            _document_cache.invalidate(file_path)
             st.error(f"Error saving {file_path}: {str(e)}")
             return False
     
+    def export_data(self, export_dir: str) -> bool:
+        """Write indented JSON copies of stories and sprints for reading or diffing"""
+        try:
+            os.makedirs(export_dir, exist_ok=True)
+            codec = PrettyJsonCodec()
+            # Read-only use, so the cached lists need no copying
+            for name, records in (("stories.json", self._load_json(self.stories_file, [])),
+                                  ("sprints.json", self._load_json(self.sprints_file, []))):
+                atomic_write_bytes(os.path.join(export_dir, name), codec.encode(records))
+            return True
+        except Exception as e:
+            st.error(f"Error exporting data: {str(e)}")
+            return False
+    
+    def get_data_version(self) -> str:
+        """Get a token that changes whenever stories or sprints are written"""
+        return json.dumps([_stamp_list(self.stories_file), _stamp_list(self.sprints_file)])
+    
+    def get_cache_stats(self) -> Dict:
+        """Get hit/miss counters for the parsed-document cache"""
+        return _document_cache.stats()
+    
+    def get_lock_stats(self) -> Dict:
+        """Get lock acquisition and wait-time metrics for this process"""
+        return lock_stats.snapshot()
+    
+    def _upsert_record(self, file_path: str, record: Dict) -> Tuple[List[Dict], Dict[str, int], bool]:
+        """Insert or replace a record by id in a new list, returning (records, id index, updated).
+
+        Must be called with the file lock held. A record carrying a
+        ``version`` older than the stored one raises VersionConflictError;
+        otherwise the version is bumped.
+        """
+        records = self._load_json(file_path, [])
+        index = _document_cache.id_index(file_path, records)
+        # Other sessions may be reading the cached list, so change a copy
+        records, index = list(records), dict(index)
+        return records, index, self._upsert_into(records, index, record)
+    
+    def _upsert_into(self, records: List[Dict], index: Dict[str, int], record: Dict) -> bool:
+        """Upsert a record into a loaded list and its index; True if it replaced one"""
+        pos = index.get(record['id'])
+        if pos is not None:
+            _check_version(records[pos], record)
+            record['version'] = records[pos].get('version', 0) + 1
+            # Store a copy, so later edits to the caller's dict stay out of the cache
+            records[pos] = copy.deepcopy(record)
+            return True
+        
+        record['version'] = 1
+        index[record['id']] = len(records)
+        records.append(copy.deepcopy(record))
+        return False
+    
+    def _modify_record(self, get_record: Callable, write_record: Callable, record_id: str,
+                       change: Callable[[Dict], None], retries: int) -> Optional[Dict]:
+        """Apply change to a fresh copy of a record, retrying on version conflicts"""
+        for attempt in range(retries + 1):
+            current = get_record(record_id)
+            if current is None:
+                return None
+            
+            record = copy.deepcopy(current)
+            change(record)
+            try:
+                return record if write_record(record) else None
+            except VersionConflictError as e:
+                if attempt == retries:
+                    st.error(f"Could not save {record_id}: {str(e)}")
+        return None
+    
+    def _find_record(self, file_path: str, record_id: str) -> Optional[Dict]:
+        """Look up a record by id through the cached index"""
+        records = self._load_json(file_path, [])
+        pos = _document_cache.id_index(file_path, records).get(record_id)
+        return records[pos] if pos is not None else None
+    
+    # Secondary story indexes
+    def _story_index(self) -> StoryIndex:
+        """Get the secondary index for the current stories document"""
+        stories = self._load_json(self.stories_file, [])
+        return _document_cache.derived(self.stories_file, stories, "stories", StoryIndex.build)
+    
+    def get_dependency_graph(self) -> DependencyGraph:
+        """Get the dependency graph over all stories, kept in step with writes"""
+        stories = self._load_json(self.stories_file, [])
+        return _document_cache.derived(self.stories_file, stories, "dependencies", DependencyGraph.build)
+    
+    def _reindex_stories(self, index: Dict[str, int], upserted: Iterable[Dict],
+                         deleted: Iterable[str]) -> Dict[str, Any]:
+        """Get the indexes for the stories list a write is about to save.
+
+        Call with the file lock held, before the save. Story indexes
+        already built for the cached list are copied and brought in step
+        with the write rather than rebuilt.
+        """
+        upserted, deleted = list(upserted), list(deleted)
+        stories = self._load_json(self.stories_file, [])
+        derived = {"id": index}
+        for name in ("stories", "dependencies"):
+            built = _document_cache.peek_derived(self.stories_file, stories, name)
+            if built is None:
+                continue
+            built = built.copy()
+            for story in upserted:
+                built.update(story)
+            for story_id in deleted:
+                built.remove(story_id)
+            derived[name] = built
+        return derived
+    
+    def query_stories(self, status: FilterValue = None, priority: FilterValue = None,
+                      assignee: FilterValue = None, label: FilterValue = None) -> List[Dict]:
+        """Get copies of the stories matching every given filter, in backlog order.
+
+        Each filter takes one value or a list of accepted values. Lookups go
+        through secondary indexes, so the cost follows the result size.
+        """
+        # Both indexes are looked up for the same list, so a concurrent write cannot mix snapshots
+        stories = self._load_json(self.stories_file, [])
+        story_index = _document_cache.derived(self.stories_file, stories, "stories", StoryIndex.build)
+        ids = story_index.ids(status=status, priority=priority, assignee=assignee, label=label)
+        positions = _document_cache.id_index(self.stories_file, stories)
+        return [_copy_record(stories[pos]) for pos in sorted(positions[story_id] for story_id in ids)]
+    
+    def count_stories(self, status: FilterValue = None, priority: FilterValue = None,
+                      assignee: FilterValue = None, label: FilterValue = None) -> int:
+        """Count stories matching every given filter"""
+        return len(self._story_index().ids(status=status, priority=priority, assignee=assignee, label=label))
+    
+    def count_stories_by(self, field: str) -> Dict:
+        """Count stories per value of status, priority, assignee or label"""
+        return self._story_index().counts(field)
+    
     # Story management
     def save_story(self, story: Dict) -> bool:
         """Save a user story"""
-        stories = self._load_json(self.stories_file, [])
-        
-        # Update existing or add new
-        updated = False
-        for i, existing_story in enumerate(stories):
-            if existing_story['id'] == story['id']:
-                stories[i] = story
-                updated = True
-                break
-        
-        if not updated:
-            stories.append(story)
+        try:
+            return self._write_story(story)
+        except VersionConflictError as e:
+            st.error(f"Story not saved: {str(e)}. Reload and try again.")
+            return False
+    
+    def _write_story(self, story: Dict) -> bool:
+        """Persist a story, raising VersionConflictError if it is stale"""
+        with file_lock(self.stories_file):
+            previous = self._find_record(self.stories_file, story['id'])
+            stories, index, updated = self._upsert_record(self.stories_file, story)
+            derived = self._reindex_stories(index, [story], ())
+            success = self._save_json(self.stories_file, stories, derived)
+            if success:
+                self._update_stats(stories=True)
         
-        success = self._save_json(self.stories_file, stories)
         if success:
             self._log_activity("Story", f"{'Updated' if updated else 'Created'} story: {story['title']}")
+            self._record_status_events([(story, previous)])
         return success
     
     def get_story(self, story_id: str) -> Optional[Dict]:
-        """Get a specific story by ID"""
-        stories = self._load_json(self.stories_file, [])
-        for story in stories:
-            if story['id'] == story_id:
-                return story
-        return None
+        """Get a copy of a specific story by ID"""
+        return _copy_record(self._find_record(self.stories_file, story_id))
     
     def get_all_stories(self) -> List[Dict]:
-        """Get all stories"""
-        return self._load_json(self.stories_file, [])
+        """Get copies of all stories"""
+        return [_copy_record(story) for story in self._load_json(self.stories_file, [])]
     
     def update_story(self, story_id: str, updated_story: Dict) -> bool:
         """Update an existing story"""
         return self.save_story(updated_story)
     
+    def modify_story(self, story_id: str, change: Callable[[Dict], None], retries: int = 3) -> Optional[Dict]:
+        """Apply change to the latest copy of a story and save it.
+
+        If another session saves the story first, the change is re-applied
+        to the newer copy up to ``retries`` times. Returns the saved story.
+        """
+        return self._modify_record(self.get_story, self._write_story, story_id, change, retries)
+    
     def delete_story(self, story_id: str) -> bool:
         """Delete a story"""
-        stories = self._load_json(self.stories_file, [])
-        stories = [s for s in stories if s['id'] != story_id]
-        success = self._save_json(self.stories_file, stories)
+        with file_lock(self.stories_file):
+            stories = self._load_json(self.stories_file, [])
+            index = _document_cache.id_index(self.stories_file, stories)
+            
+            pos = index.get(story_id)
+            if pos is not None:
+                stories = stories[:pos] + stories[pos + 1:]
+                index = dict(index)
+                del index[story_id]
+                # Only the records after the removed one change position
+                for i in range(pos, len(stories)):
+                    index[stories[i]['id']] = i
+            
+            derived = self._reindex_stories(index, (), [story_id])
+            success = self._save_json(self.stories_file, stories, derived)
+            if success:
+                self._update_stats(stories=True)
         if success:
             self._log_activity("Story", f"Deleted story: {story_id}")
         return success
@@ -93,81 +467,200 @@ class DataStore:
     # Sprint management
     def save_sprint(self, sprint: Dict) -> bool:
         """Save a sprint"""
-        sprints = self._load_json(self.sprints_file, [])
-        
-        # Update existing or add new
-        updated = False
-        for i, existing_sprint in enumerate(sprints):
-            if existing_sprint['id'] == sprint['id']:
-                sprints[i] = sprint
-                updated = True
-                break
-        
-        if not updated:
-            sprints.append(sprint)
+        try:
+            return self._write_sprint(sprint)
+        except VersionConflictError as e:
+            st.error(f"Sprint not saved: {str(e)}. Reload and try again.")
+            return False
+    
+    def _write_sprint(self, sprint: Dict) -> bool:
+        """Persist a sprint, raising VersionConflictError if it is stale"""
+        with file_lock(self.sprints_file):
+            sprints, index, updated = self._upsert_record(self.sprints_file, sprint)
+            success = self._save_json(self.sprints_file, sprints, {"id": index})
+            if success:
+                self._update_stats(sprints=True)
         
-        success = self._save_json(self.sprints_file, sprints)
         if success:
             self._log_activity("Sprint", f"{'Updated' if updated else 'Created'} sprint: {sprint['name']}")
         return success
     
     def get_sprint(self, sprint_id: str) -> Optional[Dict]:
-        """Get a specific sprint by ID"""
-        sprints = self._load_json(self.sprints_file, [])
-        for sprint in sprints:
-            if sprint['id'] == sprint_id:
-                return sprint
-        return None
+        """Get a copy of a specific sprint by ID"""
+        return _copy_record(self._find_record(self.sprints_file, sprint_id))
     
     def get_all_sprints(self) -> List[Dict]:
-        """Get all sprints"""
-        return self._load_json(self.sprints_file, [])
+        """Get copies of all sprints"""
+        return [_copy_record(sprint) for sprint in self._load_json(self.sprints_file, [])]
     
     def get_current_sprint(self) -> Optional[Dict]:
-        """Get the currently active sprint"""
-        sprints = self._load_json(self.sprints_file, [])
-        for sprint in sprints:
+        """Get a copy of the currently active sprint"""
+        for sprint in self._load_json(self.sprints_file, []):
             if sprint.get('status') == 'Active':
-                return sprint
+                return _copy_record(sprint)
         return None
     
     def update_sprint(self, sprint_id: str, updated_sprint: Dict) -> bool:
         """Update an existing sprint"""
         return self.save_sprint(updated_sprint)
     
-    # Activity logging
-    def _log_activity(self, activity_type: str, description: str):
-        """Log an activity"""
-        activities = self._load_json(self.activities_file, [])
+    def modify_sprint(self, sprint_id: str, change: Callable[[Dict], None], retries: int = 3) -> Optional[Dict]:
+        """Apply change to the latest copy of a sprint and save it, retrying on conflicts"""
+        return self._modify_record(self.get_sprint, self._write_sprint, sprint_id, change, retries)
+    
+    # Batched writes
+    @contextmanager
+    def transaction(self):
+        """Buffer story and sprint writes and commit them together on exit.
+
+        Each data file is rewritten at most once and all activity entries
+        go to the log in a single append. Every version is checked before
+        either file is written, so a conflict leaves all data untouched.
+        """
+        txn = StoreTransaction()
+        yield txn
+        if txn.is_empty():
+            txn.committed = True
+            return
+        try:
+            activities = self._commit_transaction(txn)
+        except VersionConflictError as e:
+            st.error(f"Changes not saved: {str(e)}. Reload and try again.")
+            return
+        if activities is not None:
+            txn.committed = True
+            self._log_activities(activities)
+    
+    def save_stories_bulk(self, stories: Iterable[Dict], delete_ids: Iterable[str] = ()) -> bool:
+        """Upsert and delete many stories with a single write"""
+        with self.transaction() as txn:
+            for story in stories:
+                txn.save_story(story)
+            for story_id in delete_ids:
+                txn.delete_story(story_id)
+        return txn.committed
+    
+    def _commit_transaction(self, txn: StoreTransaction) -> Optional[List[Dict]]:
+        """Persist a transaction, returning its activity entries or None on failure.
+
+        Both file locks are held while every story and sprint version is
+        checked, and neither file is written unless all of them pass.
+        """
+        write_stories = bool(txn.stories or txn.deleted_stories)
+        activities = []
+        with ExitStack() as locks:
+            # Always stories before sprints, so two transactions cannot deadlock
+            if write_stories:
+                locks.enter_context(file_lock(self.stories_file))
+            if txn.sprints:
+                locks.enter_context(file_lock(self.sprints_file))
+            
+            if write_stories:
+                self._check_batch(self.stories_file, txn.stories)
+            self._check_batch(self.sprints_file, txn.sprints)
+            # Stored records are never changed in place, so these stay as they were
+            previous = {story_id: self._find_record(self.stories_file, story_id) for story_id in txn.stories}
+            
+            if write_stories:
+                if not self._apply_batch(self.stories_file, txn.stories, txn.deleted_stories):
+                    return None
+                self._update_stats(stories=True)
+            if txn.sprints:
+                if not self._apply_batch(self.sprints_file, txn.sprints, set()):
+                    return None
+                self._update_stats(sprints=True)
         
-        activity = {
+        for story in txn.stories.values():
+            verb = "Updated" if story['version'] > 1 else "Created"
+            activities.append(self._make_activity("Story", f"{verb} story: {story['title']}"))
+        for story_id in txn.deleted_stories:
+            activities.append(self._make_activity("Story", f"Deleted story: {story_id}"))
+        for sprint in txn.sprints.values():
+            verb = "Updated" if sprint['version'] > 1 else "Created"
+            activities.append(self._make_activity("Sprint", f"{verb} sprint: {sprint['name']}"))
+        self._record_status_events((story, previous[story_id]) for story_id, story in txn.stories.items())
+        return activities
+    
+    def _check_batch(self, file_path: str, upserts: Dict[str, Dict]):
+        """Raise VersionConflictError if any upsert is stale. Call with the file lock held."""
+        if not upserts:
+            return
+        records = self._load_json(file_path, [])
+        index = _document_cache.id_index(file_path, records)
+        for record_id, record in upserts.items():
+            pos = index.get(record_id)
+            if pos is not None:
+                _check_version(records[pos], record)
+    
+    def _apply_batch(self, file_path: str, upserts: Dict[str, Dict], deletes: set) -> bool:
+        """Apply many upserts and deletes to one file and write it once.
+
+        Must be called with the file lock held, after ``_check_batch``.
+        """
+        records = self._load_json(file_path, [])
+        index = _document_cache.id_index(file_path, records)
+        # Build the new list and indexes aside; readers keep the cached ones
+        records, index = list(records), dict(index)
+        for record in upserts.values():
+            self._upsert_into(records, index, record)
+        
+        if deletes & index.keys():
+            records = [r for r in records if r['id'] not in deletes]
+            index = _build_id_index(records)
+        
+        if file_path == self.stories_file:
+            derived = self._reindex_stories(index, upserts.values(), deletes)
+        else:
+            derived = {"id": index}
+        return self._save_json(file_path, records, derived)
+    
+    # Activity logging
+    def _make_activity(self, activity_type: str, description: str) -> Dict:
+        """Build an activity entry stamped with the current time"""
+        now = datetime.now()
+        return {
             "id": self._generate_id(),
             "type": activity_type,
             "description": description,
-            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "date": datetime.now().strftime("%Y-%m-%d")
+            "timestamp": now.strftime("%Y-%m-%d %H:%M:%S"),
+            "date": now.strftime("%Y-%m-%d")
         }
-        
-        activities.insert(0, activity)  # Add to beginning
-        
-        # Keep only last 100 activities
-        activities = activities[:100]
-        
-        self._save_json(self.activities_file, activities)
+    
+    def _log_activity(self, activity_type: str, description: str):
+        """Log an activity"""
+        self._log_activities([self._make_activity(activity_type, description)])
+    
+    def _log_activities(self, activities: List[Dict]):
+        """Append several activity entries in one write"""
+        try:
+            self._ensure_activity_log()
+            self.activity_log.extend(activities)
+        except OSError as e:
+            st.error(f"Error logging activity: {str(e)}")
     
     def get_recent_activities(self, limit: int = 10) -> List[Dict]:
         """Get recent activities"""
-        activities = self._load_json(self.activities_file, [])
-        return activities[:limit]
+        try:
+            self._ensure_activity_log()
+            return self.activity_log.recent(limit)
+        except OSError as e:
+            st.error(f"Error loading activities: {str(e)}")
+            return []
+    
+    def _ensure_activity_log(self):
+        """Carry entries from the legacy activities.json into the JSONL log once"""
+        if not os.path.exists(self.activity_log.file_path) and os.path.exists(self.activities_file):
+            self.activity_log.import_legacy(self._load_json(self.activities_file, []))
     
     # Quick stats and analytics
     def get_quick_stats(self) -> Dict:
         """Get quick statistics for dashboard"""
-        stories = self._load_json(self.stories_file, [])
-        current_sprint = self.get_current_sprint()
+        stats = self._get_stats()
+        status_counts = stats['status_counts']
+        current_sprint = stats['current_sprint']
         
-        active_stories = len([s for s in stories if s.get('status') not in ['Done', 'Cancelled']])
-        completed_stories = len([s for s in stories if s.get('status') == 'Done'])
+        completed_stories = status_counts.get('Done', 0)
+        active_stories = stats['total_stories'] - completed_stories - status_counts.get('Cancelled', 0)
         
         sprint_days_left = 0
         velocity = 0
@@ -184,6 +677,49 @@ class DataStore:
             "velocity": velocity
         }
     
+    def _get_stats(self) -> Dict:
+        """Get the persisted dashboard counters, rebuilding any stale part.
+
+        stats.json records the stamps of the story and sprint files it was
+        computed from, so reading it costs two stats and one small parse
+        instead of a pass over every story.
+        """
+        stats = self._load_json(self.stats_file, None)
+        stats = stats if isinstance(stats, dict) else {}
+        
+        stale_stories = stats.get('stories_stamp') != _stamp_list(self.stories_file)
+        stale_sprints = stats.get('sprints_stamp') != _stamp_list(self.sprints_file)
+        if stale_stories or stale_sprints:
+            stats = self._update_stats(stories=stale_stories, sprints=stale_sprints)
+        return stats
+    
+    def _update_stats(self, stories: bool = False, sprints: bool = False) -> Dict:
+        """Recompute the story and/or sprint counters and persist them"""
+        with file_lock(self.stats_file):
+            loaded = self._load_json(self.stats_file, None)
+            # Copy so the cached document only changes once the write succeeds
+            stats = dict(loaded) if isinstance(loaded, dict) else {}
+            
+            if stories or 'status_counts' not in stats:
+                counts = self.count_stories_by('status')
+                stats['status_counts'] = {status: n for status, n in counts.items() if status is not None}
+                stats['total_stories'] = sum(counts.values())
+                stats['stories_stamp'] = _stamp_list(self.stories_file)
+            
+            if sprints or 'current_sprint' not in stats:
+                current_sprint = self.get_current_sprint()
+                stats['current_sprint'] = {
+                    "id": current_sprint['id'],
+                    "end_date": current_sprint['end_date'],
+                    "completed_points": current_sprint.get('completed_points', 0)
+                } if current_sprint else None
+                stats['sprints_stamp'] = _stamp_list(self.sprints_file)
+            
+            # The counters are derived data, so a corrupt file is safe to replace
+            self._unreadable_files.discard(self.stats_file)
+            self._save_json(self.stats_file, stats)
+        return stats
+    
     def get_current_sprint_data(self) -> Dict:
         """Get comprehensive current sprint data for AI analysis"""
         current_sprint = self.get_current_sprint()
@@ -206,8 +742,7 @@ class DataStore:
     def get_today_tasks(self) -> List[Dict]:
         """Get tasks scheduled for today"""
         # For demo purposes, return stories in progress
-        stories = self._load_json(self.stories_file, [])
-        return [s for s in stories if s.get('status') == 'In Progress'][:5]
+        return self.query_stories(status='In Progress')[:5]
     
     def get_recent_updates(self) -> List[Dict]:
         """Get recent team updates for standup"""
@@ -229,7 +764,7 @@ class DataStore:
     
     def get_velocity_history(self) -> List[Dict]:
         """Get historical velocity data"""
-        sprints = self._load_json(self.sprints_file, [])
+        sprints = self.get_all_sprints()
         completed_sprints = [s for s in sprints if s.get('status') == 'Completed']
         
         return [
@@ -242,45 +777,80 @@ class DataStore:
             for sprint in completed_sprints
         ]
     
+    def _record_status_events(self, saved: Iterable[Tuple[Dict, Optional[Dict]]]):
+        """Record a status event for each saved story whose status differs from the record it replaced"""
+        events = []
+        sprint = None
+        for story, previous in saved:
+            if previous is None or previous.get('status') == story.get('status'):
+                continue
+            if sprint is None:
+                sprint = self.get_current_sprint() or {}
+            sprint_id = sprint.get('id') if story['id'] in sprint.get('stories', []) else None
+            events.append(make_status_event(story, previous.get('status'), story.get('status'), sprint_id))
+        self.record_status_changes(events)
+    
+    def record_status_changes(self, events: List[Dict]):
+        """Append story status transitions to the event stream"""
+        try:
+            self.story_events.extend(events)
+        except Exception as e:
+            st.error(f"Error recording status changes: {str(e)}")
+    
     def get_workflow_data(self) -> Dict:
         """Get workflow data for bottleneck analysis"""
-        stories = self._load_json(self.stories_file, [])
-        
-        status_counts = {}
-        for story in stories:
-            status = story.get('status', 'Unknown')
-            status_counts[status] = status_counts.get(status, 0) + 1
+        status_counts = {
+            status if status is not None else 'Unknown': count
+            for status, count in self.count_stories_by('status').items()
+        }
+        projection = status_projection(self.story_events)
+        graph = self.get_dependency_graph()
         
         return {
             "status_distribution": status_counts,
-            "total_stories": len(stories),
-            "avg_cycle_time": 5.2,  # Mock data - calculate from actual story history
-            "blocked_stories": len([s for s in stories if 'blocked' in s.get('labels', [])])
+            "total_stories": sum(status_counts.values()),
+            "avg_cycle_time": projection.avg_cycle_time(),
+            "avg_lead_time": projection.avg_lead_time(),
+            "blocked_stories": self.count_stories(label='blocked'),
+            "waiting_on_dependencies": len(graph.blocked_stories()),
+            "dependency_cycles": graph.cycles(),
+            "critical_path_points": graph.critical_path()['points'],
+            "top_blockers": [
+                {"story_id": story_id, "stories_waiting": count}
+                for story_id, count in graph.top_blockers()
+            ]
         }
     
     def get_burndown_history(self, sprint_id: str) -> List[Dict]:
-        """Get burndown history for a sprint"""
-        # Mock burndown data - in real implementation, this would be tracked daily
+        """Get the remaining points per day of a sprint from recorded status changes"""
         sprint = self.get_sprint(sprint_id)
         if not sprint:
             return []
         
         start_date = datetime.strptime(sprint['start_date'], "%Y-%m-%d")
+        end_date = datetime.strptime(sprint['end_date'], "%Y-%m-%d")
         total_points = sprint.get('total_points', 0)
+        completed_by_day = status_projection(self.story_events).completed_by_day(sprint_id)
         
-        # Generate mock actual burndown
-        days = min(7, (datetime.now() - start_date).days)
-        actual_line = []
+        # Points completed before events were recorded count from day one
+        untracked = sprint.get('completed_points', 0) - sum(completed_by_day.values())
+        remaining = total_points - max(0, untracked)
+        
+        # Changes made before the sprint started land on its first day
+        start_key = start_date.strftime("%Y-%m-%d")
+        for day, points in completed_by_day.items():
+            if day < start_key:
+                remaining -= points
         
+        days = min((datetime.now() - start_date).days, (end_date - start_date).days)
+        actual_line = []
         for i in range(days + 1):
-            # Mock actual progress with some variance
-            actual_remaining = total_points - (total_points * i / 10) - (i * 2)
-            actual_remaining = max(0, actual_remaining)
-            
+            date = (start_date + timedelta(days=i)).strftime("%Y-%m-%d")
+            remaining -= completed_by_day.get(date, 0)
             actual_line.append({
                 "day": i,
-                "actual_remaining": round(actual_remaining, 1),
-                "date": (start_date + timedelta(days=i)).strftime("%Y-%m-%d")
+                "actual_remaining": round(max(0, remaining), 1),
+                "date": date
             })
         
         return actual_line
@@ -289,3 +859,19 @@ class DataStore:
         """Generate a unique ID"""
         import uuid
         return str(uuid.uuid4())[:8]
+
+
+def create_data_store() -> DataStore:
+    """Create the DataStore selected by the NEURALSPRINT_STORAGE env var.
+
+    ``json`` (the default) keeps the JSON files in ``data/``; ``sqlite``
+    uses the SQLite backend at ``NEURALSPRINT_DB_PATH``.
+    """
+    backend = os.getenv("NEURALSPRINT_STORAGE", "json").strip().lower()
+    if backend == "sqlite":
+        from core.sqlite_store import SQLiteDataStore
+        return SQLiteDataStore()
+    if backend != "json":
+        raise ValueError(f"Unknown NEURALSPRINT_STORAGE backend: {backend}")
+    return DataStore()
+
@@ -0,0 +1,214 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+
+class DependencyGraph:
+    """Story dependency graph with reverse edges, kept in step with writes.
+
+    Edges are updated per story as it is saved or deleted. Whole-graph
+    results (topological order, cycles, critical path) are computed on
+    first use after a change and reused until the next one.
+    """
+
+    def __init__(self):
+        self._deps: Dict[str, Tuple[str, ...]] = {}
+        # Reverse edges; may name ids whose story no longer exists
+        self._dependents: Dict[str, Set[str]] = {}
+        self._points: Dict[str, float] = {}
+        self._done: Set[str] = set()
+        self._version = 0
+        self._analysis: Optional[Tuple[int, List[str], Set[str]]] = None
+
+    @classmethod
+    def build(cls, stories: List[Dict]) -> "DependencyGraph":
+        """Build the graph for a full list of stories"""
+        graph = cls()
+        for story in stories:
+            graph.update(story)
+        return graph
+
+    def copy(self) -> "DependencyGraph":
+        """Get an independent copy to update without touching this one"""
+        graph = DependencyGraph()
+        graph._deps = dict(self._deps)
+        graph._dependents = {story_id: set(ids) for story_id, ids in self._dependents.items()}
+        graph._points = dict(self._points)
+        graph._done = set(self._done)
+        # The cached analysis is replaced, never changed, so it can be shared
+        graph._version = self._version
+        graph._analysis = self._analysis
+        return graph
+
+    def update(self, story: Dict):
+        """Add a story or refresh its edges, points and done state"""
+        story_id = story['id']
+        deps = tuple(dict.fromkeys(d for d in story.get('dependencies') or [] if d != story_id))
+        points = story.get('story_points') or 0
+        done = story.get('status') == 'Done'
+        old_deps = self._deps.get(story_id)
+        if (old_deps == deps and self._points.get(story_id) == points
+                and (story_id in self._done) == done):
+            return
+
+        if old_deps != deps:
+            for dep in old_deps or ():
+                self._unlink(dep, story_id)
+            for dep in deps:
+                self._dependents.setdefault(dep, set()).add(story_id)
+        self._deps[story_id] = deps
+        self._points[story_id] = points
+        if done:
+            self._done.add(story_id)
+        else:
+            self._done.discard(story_id)
+        self._version += 1
+
+    def remove(self, story_id: str):
+        """Drop a story; stories depending on it no longer wait for it"""
+        for dep in self._deps.pop(story_id, ()):
+            self._unlink(dep, story_id)
+        self._points.pop(story_id, None)
+        self._done.discard(story_id)
+        self._version += 1
+
+    def _unlink(self, dep: str, story_id: str):
+        dependents = self._dependents.get(dep)
+        if dependents is not None:
+            dependents.discard(story_id)
+            if not dependents:
+                del self._dependents[dep]
+
+    def __contains__(self, story_id: str) -> bool:
+        return story_id in self._deps
+
+    def __len__(self) -> int:
+        return len(self._deps)
+
+    def dependencies(self, story_id: str) -> List[str]:
+        """Get the existing stories a story depends on"""
+        return [dep for dep in self._deps.get(story_id, ()) if dep in self._deps]
+
+    def dependents(self, story_id: str) -> List[str]:
+        """Get the stories that depend on a story"""
+        return sorted(self._dependents.get(story_id, ()))
+
+    def blocked_by(self, story_id: str) -> List[str]:
+        """Get the unfinished stories a story is waiting on"""
+        return [dep for dep in self.dependencies(story_id) if dep not in self._done]
+
+    def blocked_stories(self) -> Dict[str, List[str]]:
+        """Get every unfinished story waiting on others, with what it waits on"""
+        blocked = {}
+        for story_id in self._deps:
+            if story_id not in self._done:
+                waiting = self.blocked_by(story_id)
+                if waiting:
+                    blocked[story_id] = waiting
+        return blocked
+
+    def top_blockers(self, limit: int = 5) -> List[Tuple[str, int]]:
+        """Get the unfinished stories holding up the most unfinished stories"""
+        counts = []
+        for story_id, dependents in self._dependents.items():
+            if story_id in self._deps and story_id not in self._done:
+                waiting = sum(1 for d in dependents if d in self._deps and d not in self._done)
+                if waiting:
+                    counts.append((story_id, waiting))
+        counts.sort(key=lambda item: (-item[1], item[0]))
+        return counts[:limit]
+
+    def _analyze(self) -> Tuple[List[str], Set[str]]:
+        """Get the topological order and the ids on or behind a cycle"""
+        if self._analysis is None or self._analysis[0] != self._version:
+            order = self.topological_order(self._deps)
+            ordered = set(order)
+            stuck = {story_id for story_id in self._deps if story_id not in ordered}
+            self._analysis = (self._version, order, stuck)
+        return self._analysis[1], self._analysis[2]
+
+    def topological_order(self, ids: Optional[Iterable[str]] = None) -> List[str]:
+        """Order stories so dependencies come first.
+
+        With ``ids``, only those stories and the edges among them are
+        considered. Stories on a cycle, or depending on one, are left out.
+        """
+        if ids is None:
+            return list(self._analyze()[0])
+
+        members = [story_id for story_id in ids if story_id in self._deps]
+        member_set = set(members)
+        waiting = {
+            story_id: sum(1 for dep in self._deps[story_id] if dep in member_set)
+            for story_id in members
+        }
+        order = [story_id for story_id in members if waiting[story_id] == 0]
+        for story_id in order:
+            for dependent in self._dependents.get(story_id, ()):
+                if dependent in member_set:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        order.append(dependent)
+        return order
+
+    def cycles(self) -> List[List[str]]:
+        """Get each group of stories that depend on one another in a circle"""
+        _, stuck = self._analyze()
+        # Tarjan's strongly connected components over the stuck stories
+        index_of, lowlink, on_stack, stack, cycles = {}, {}, set(), [], []
+        counter = 0
+        for root in sorted(stuck):
+            if root in index_of:
+                continue
+            work = [(root, iter(d for d in self._deps[root] if d in stuck))]
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            while work:
+                node, children = work[-1]
+                child = next(children, None)
+                if child is not None:
+                    if child not in index_of:
+                        index_of[child] = lowlink[child] = counter
+                        counter += 1
+                        stack.append(child)
+                        on_stack.add(child)
+                        work.append((child, iter(d for d in self._deps[child] if d in stuck)))
+                    elif child in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[child])
+                    continue
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1:
+                        cycles.append(sorted(component))
+        return cycles
+
+    def critical_path(self) -> Dict:
+        """Get the dependency chain with the most unfinished points"""
+        order, _ = self._analyze()
+        total: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for story_id in order:
+            remaining = 0 if story_id in self._done else self._points[story_id]
+            best_dep = max(self.dependencies(story_id), key=lambda d: total[d], default=None)
+            total[story_id] = remaining + (total[best_dep] if best_dep else 0)
+            previous[story_id] = best_dep
+
+        if not total:
+            return {"points": 0, "story_ids": []}
+        end = max(total, key=total.get)
+        path = []
+        node = end
+        while node is not None:
+            path.append(node)
+            node = previous[node]
+        return {"points": total[end], "story_ids": list(reversed(path))}
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+class LockStats:
+    """Process-wide counters for time spent waiting on data locks"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.acquisitions = 0
+        self.contended = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, waited: float):
+        """Record one acquisition that waited ``waited`` seconds"""
+        with self._lock:
+            self.acquisitions += 1
+            self.total_wait += waited
+            self.max_wait = max(self.max_wait, waited)
+            # Anything over a millisecond means another holder was in the way
+            if waited > 0.001:
+                self.contended += 1
+
+    def snapshot(self) -> Dict:
+        """Get the counters as a dict, with wait times in milliseconds"""
+        with self._lock:
+            return {
+                "acquisitions": self.acquisitions,
+                "contended": self.contended,
+                "total_wait_ms": round(self.total_wait * 1000, 2),
+                "avg_wait_ms": round(self.total_wait * 1000 / self.acquisitions, 3) if self.acquisitions else 0.0,
+                "max_wait_ms": round(self.max_wait * 1000, 2)
+            }
+
+
+lock_stats = LockStats()
+
+_thread_locks: Dict[str, threading.Lock] = {}
+_thread_locks_guard = threading.Lock()
+
+# Per-thread set of paths already locked, for re-entrant use
+_held = threading.local()
+
+
+def _thread_lock(path: str) -> threading.Lock:
+    """Get the in-process lock guarding a path"""
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(path, threading.Lock())
+
+
+@contextmanager
+def file_lock(file_path: str):
+    """Hold an exclusive advisory lock on ``file_path`` across processes.
+
+    The lock is taken on a ``.lock`` sidecar so the data file itself can be
+    replaced atomically while the lock is held. Re-entrant within a thread.
+    """
+    path = os.path.abspath(file_path)
+    held = getattr(_held, "paths", None)
+    if held is None:
+        held = _held.paths = set()
+    if path in held:
+        yield
+        return
+
+    thread_lock = _thread_lock(path)
+    started = time.perf_counter()
+    thread_lock.acquire()
+    handle = None
+    try:
+        if fcntl is not None:
+            handle = open(f"{path}.lock", 'a')
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        lock_stats.record(time.perf_counter() - started)
+
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+    finally:
+        if handle is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            handle.close()
+        thread_lock.release()
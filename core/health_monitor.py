@@ -0,0 +1,111 @@
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+# Seconds a successful probe stays fresh before the next one
+PROBE_INTERVAL = 15
+
+# First retry delay while offline; doubles per failure up to MAX_BACKOFF
+OFFLINE_RETRY = 2
+MAX_BACKOFF = 60
+
+PROBE_TIMEOUT = 3
+
+# How long the very first status request waits for the first probe
+FIRST_PROBE_WAIT = 1.0
+
+
+class HealthMonitor:
+    """Probes a health URL on a background thread and caches the result.
+
+    Callers read the cached status without any network I/O. While the
+    server is offline, probes back off exponentially.
+    """
+
+    def __init__(self, url: str, session: requests.Session, interval: float = PROBE_INTERVAL,
+                 timeout: float = PROBE_TIMEOUT):
+        self.url = url
+        self.session = session
+        self.interval = interval
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._online = False
+        self._error: Optional[str] = None
+        self._checked_at: Optional[float] = None
+        self._failures = 0
+        self._first_probe = threading.Event()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            self._probe()
+            self._wake.wait(self._next_delay())
+            self._wake.clear()
+
+    def _probe(self):
+        try:
+            response = self.session.get(self.url, timeout=self.timeout)
+            online = response.status_code == 200
+            error = None if online else f"HTTP {response.status_code}"
+        except Exception as e:
+            online, error = False, str(e)
+        self.report(online, error)
+
+    def _next_delay(self) -> float:
+        with self._lock:
+            if self._online:
+                return self.interval
+            return min(MAX_BACKOFF, OFFLINE_RETRY * 2 ** max(0, self._failures - 1))
+
+    def report(self, online: bool, error: Optional[str] = None):
+        """Record a status seen by a probe or by a real request"""
+        with self._lock:
+            self._online = online
+            self._error = error
+            self._checked_at = time.time()
+            self._failures = 0 if online else self._failures + 1
+        self._first_probe.set()
+
+    def refresh(self):
+        """Probe again now instead of waiting for the next scheduled probe"""
+        self._ensure_started()
+        self._wake.set()
+
+    def is_online(self) -> bool:
+        """Get the cached status, waiting briefly only before the first probe"""
+        self._ensure_started()
+        self._first_probe.wait(FIRST_PROBE_WAIT)
+        with self._lock:
+            return self._online
+
+    def status(self) -> Dict:
+        """Get the cached status with the last error and probe age"""
+        self._ensure_started()
+        with self._lock:
+            return {
+                "online": self._online,
+                "error": self._error,
+                "checked_seconds_ago": round(time.time() - self._checked_at, 1) if self._checked_at else None,
+                "consecutive_failures": self._failures
+            }
+
+
+_monitors: Dict[str, HealthMonitor] = {}
+_monitors_lock = threading.Lock()
+
+
+def get_health_monitor(url: str, session: requests.Session) -> HealthMonitor:
+    """Get the process-wide monitor for a URL, shared by every Streamlit session"""
+    with _monitors_lock:
+        if url not in _monitors:
+            _monitors[url] = HealthMonitor(url, session)
+        return _monitors[url]
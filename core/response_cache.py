@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+# Responses kept in memory per process
+MEMORY_ENTRIES = 128
+
+# Responses expire after a day; the data version in the key already
+# retires them sooner when the underlying stories or sprints change
+DEFAULT_TTL = 24 * 3600
+
+# Oldest-used responses are dropped once the disk tier grows past this
+MAX_DISK_BYTES = 20 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses(accessed_at);
+"""
+
+
+def make_key(model: str, messages: List[Dict], temperature: float, max_tokens: int,
+             data_version: str = "") -> str:
+    """Hash everything that determines a completion into a cache key"""
+    material = json.dumps([model, messages, temperature, max_tokens, data_version],
+                          sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier cache of LLM responses: an in-memory LRU over a SQLite file"""
+
+    def __init__(self, db_path: str, memory_entries: int = MEMORY_ENTRIES,
+                 ttl: float = DEFAULT_TTL, max_disk_bytes: int = MAX_DISK_BYTES):
+        self.db_path = db_path
+        self.memory_entries = memory_entries
+        self.ttl = ttl
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Open a short-lived connection that commits on success and always closes"""
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _remember(self, key: str, response: str, expires_at: float):
+        with self._lock:
+            self._memory[key] = (response, expires_at)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response that has not expired"""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._memory.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._memory[key]
+
+        try:
+            with self._connect() as conn:
+                row = conn.execute("SELECT response, expires_at FROM responses WHERE key = ? AND expires_at > ?",
+                                   (key, now)).fetchone()
+                if row:
+                    conn.execute("UPDATE responses SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            row = None
+
+        if row is None:
+            with self._lock:
+                self.misses += 1
+            return None
+        self._remember(key, row[0], row[1])
+        with self._lock:
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, response: str):
+        """Store a response in both tiers, evicting expired and least-used entries"""
+        now = time.time()
+        expires_at = now + self.ttl
+        self._remember(key, response, expires_at)
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, size, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, response, len(response.encode('utf-8')), expires_at, now)
+                )
+                conn.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+                self._evict_to_size(conn)
+        except sqlite3.Error:
+            # The memory tier still serves this process
+            pass
+
+    def _evict_to_size(self, conn: sqlite3.Connection):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_disk_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY accessed_at").fetchall():
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_disk_bytes:
+                break
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._memory.clear()
+        try:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM responses")
+        except sqlite3.Error:
+            pass
+
+    def stats(self) -> Dict:
+        """Get hit/miss counters and the memory tier size"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "memory_entries": len(self._memory)}
+
+
+_caches: Dict[str, ResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(db_path: str = None) -> ResponseCache:
+    """Get the process-wide cache for a database path (NEURALSPRINT_AI_CACHE_PATH by default)"""
+    db_path = db_path or os.getenv("NEURALSPRINT_AI_CACHE_PATH", os.path.join("data", "ai_cache.db"))
+    with _caches_lock:
+        if db_path not in _caches:
+            _caches[db_path] = ResponseCache(db_path)
+        return _caches[db_path]
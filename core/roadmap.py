@@ -0,0 +1,184 @@
+import heapq
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from core.dependency_graph import DependencyGraph
+from core.sprint_planner import PRIORITY_WEIGHTS, UNITS_PER_POINT
+
+
+def _same_record(old: Optional[Dict], new: Dict) -> bool:
+    """Whether two copies hold the same saved version of a story"""
+    if old is None:
+        return False
+    return old is new or (old.get('version') is not None and old.get('version') == new.get('version'))
+
+
+class Roadmap:
+    """Greedy allocation of a prioritized backlog across future sprints.
+
+    Stories are taken highest priority first, dependencies before the
+    stories that need them, and each goes into the earliest sprint with
+    room that is not before any of its dependencies. Each step depends
+    only on the steps before it, so after a change the order and
+    placements are kept up to the first step the change can affect, and
+    only the rest is recomputed.
+    """
+
+    def __init__(self, sprints: List[Dict]):
+        # Each sprint needs a "capacity" in points; other keys are passed through
+        self.sprints = sprints
+        self._capacity_units = [int(max(0, s.get('capacity', 0)) * UNITS_PER_POINT + 1e-9) for s in sprints]
+        self._stories: Dict[str, Dict] = {}
+        # First-seen order breaks priority ties, so existing stories keep their relative order
+        self._seq: Dict[str, int] = {}
+        # Per story: (rank, units, dependencies within the backlog)
+        self._steps: Dict[str, Tuple[Tuple, Optional[int], Tuple[str, ...]]] = {}
+        self._order: List[str] = []
+        self._pos: Dict[str, int] = {}
+        # Stories on or behind a dependency cycle, never ordered
+        self._unordered: Set[str] = set()
+        # Sprint index per ordered story (None if it did not fit) and the units it took
+        self._placements: List[Optional[int]] = []
+        self._placed_units: List[int] = []
+        self._remaining = list(self._capacity_units)
+        self.last_recomputed = 0
+
+    def _step(self, story: Dict, graph: DependencyGraph) -> Tuple[Tuple, Optional[int], Tuple[str, ...]]:
+        sid = story['id']
+        weight = PRIORITY_WEIGHTS.get(story.get('priority'), PRIORITY_WEIGHTS["Medium"])
+        points = story.get('story_points')
+        units = None if points is None else max(0, int(round(float(points) * UNITS_PER_POINT)))
+        deps = tuple(d for d in graph.dependencies(sid) if d in self._stories)
+        return (-weight, self._seq[sid], sid), units, deps
+
+    def refresh(self, stories: List[Dict], graph: Optional[DependencyGraph] = None) -> "Roadmap":
+        """Re-plan for the current backlog, recomputing only what changed.
+
+        ``stories`` is the unfinished, unscheduled backlog in backlog order.
+        Stories are compared by id and saved version, so a story that has
+        not been saved again costs nothing. ``graph`` is the store's dependency graph; one is
+        built from ``stories`` if it is not given.
+        """
+        current = {s['id']: s for s in stories}
+        removed = [sid for sid in self._stories if sid not in current]
+        changed = [s for sid, s in current.items() if not _same_record(self._stories.get(sid), s)]
+        return self.apply_changes(changed, removed, graph if graph is not None else DependencyGraph.build(stories))
+
+    def update_story(self, story: Dict, graph: DependencyGraph) -> "Roadmap":
+        """Re-plan after one story was added, changed or finished"""
+        if story.get('status') == 'Done':
+            return self.apply_changes([], [story['id']], graph)
+        return self.apply_changes([story], [], graph)
+
+    def apply_changes(self, changed: Iterable[Dict], removed: Iterable[str], graph: DependencyGraph) -> "Roadmap":
+        """Re-plan after stories were added or changed and others left the backlog"""
+        changed, removed = list(changed), [sid for sid in removed if sid in self._stories]
+        for sid in removed:
+            del self._stories[sid]
+        joined = []
+        for story in changed:
+            sid = story['id']
+            if sid not in self._stories:
+                joined.append(sid)
+            if sid not in self._seq:
+                self._seq[sid] = len(self._seq)
+            self._stories[sid] = story
+
+        # Stories that joined or left change the in-backlog dependencies of their dependents
+        affected = {story['id'] for story in changed}
+        for sid in removed + joined:
+            affected.update(d for d in graph.dependents(sid) if d in self._stories)
+
+        order, pos = self._order, self._pos
+        start = len(order)
+        new_ids = []
+        for sid in removed:
+            self._steps.pop(sid, None)
+            if sid in pos:
+                start = min(start, pos[sid])
+        for sid in affected:
+            step = self._step(self._stories[sid], graph)
+            if self._steps.get(sid) == step:
+                continue
+            self._steps[sid] = step
+            if sid in pos:
+                start = min(start, pos[sid])
+            else:
+                new_ids.append(sid)
+            start = min(start, self._earliest_pop(sid, start))
+
+        if start == len(order) and not new_ids:
+            self.last_recomputed = 0
+            return self
+        self._replan_from(start, new_ids, graph)
+        return self
+
+    def _earliest_pop(self, sid: str, limit: int) -> int:
+        """First position before ``limit`` where the old order would now take ``sid`` instead"""
+        rank, _, deps = self._steps[sid]
+        pos = self._pos
+        if any(dep not in pos or pos[dep] >= limit for dep in deps):
+            return limit
+        # Ready once its dependencies are placed; taken at the first step whose story ranks lower
+        for index in range(max((pos[dep] + 1 for dep in deps), default=0), limit):
+            if rank < self._steps[self._order[index]][0]:
+                return index
+        return limit
+
+    def _replan_from(self, start: int, new_ids: List[str], graph: DependencyGraph):
+        """Keep the first ``start`` steps and recompute the order and placements after them"""
+        order, pos = self._order, self._pos
+        # Give back the capacity used by the steps being recomputed
+        for sprint, units in zip(self._placements[start:], self._placed_units[start:]):
+            if sprint is not None:
+                self._remaining[sprint] += units
+        suffix = [sid for sid in order[start:] if sid in self._stories]
+        suffix += [sid for sid in self._unordered | set(new_ids) if sid in self._stories and sid not in pos]
+        for sid in order[start:]:
+            del pos[sid]
+        del order[start:]
+        del self._placements[start:]
+        del self._placed_units[start:]
+
+        # Kahn's algorithm over the rest, releasing the highest-priority ready story first
+        waiting = {sid: sum(1 for dep in self._steps[sid][2] if dep not in pos) for sid in suffix}
+        ready = [self._steps[sid][0] for sid, count in waiting.items() if count == 0]
+        heapq.heapify(ready)
+        while ready:
+            sid = heapq.heappop(ready)[2]
+            _, units, deps = self._steps[sid]
+            sprint = None
+            if units is not None and all(self._placements[pos[dep]] is not None for dep in deps):
+                earliest = max((self._placements[pos[dep]] for dep in deps), default=0)
+                for index in range(earliest, len(self._remaining)):
+                    if self._remaining[index] >= units:
+                        sprint = index
+                        self._remaining[index] -= units
+                        break
+            pos[sid] = len(order)
+            order.append(sid)
+            self._placements.append(sprint)
+            self._placed_units.append(units if sprint is not None else 0)
+            for dependent in graph.dependents(sid):
+                if dependent in waiting:
+                    waiting[dependent] -= 1
+                    if waiting[dependent] == 0:
+                        heapq.heappush(ready, self._steps[dependent][0])
+
+        self._unordered = {sid for sid in suffix if sid not in pos}
+        self.last_recomputed = len(suffix)
+
+    def allocation(self) -> List[Dict]:
+        """Get each sprint with the stories and points allocated to it"""
+        plan = [
+            {"sprint": sprint, "story_ids": [], "planned_points": 0.0, "capacity": sprint.get('capacity', 0)}
+            for sprint in self.sprints
+        ]
+        for sid, index, units in zip(self._order, self._placements, self._placed_units):
+            if index is not None:
+                plan[index]["story_ids"].append(sid)
+                plan[index]["planned_points"] += units / UNITS_PER_POINT
+        return plan
+
+    def unscheduled(self) -> List[str]:
+        """Get stories that did not fit, are unestimated, or wait on such stories"""
+        return [sid for sid in self._stories if sid not in self._pos or self._placements[self._pos[sid]] is None]
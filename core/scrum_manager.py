@@ -2,10 +2,25 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import json
 
+from core.burndown import get_burndown_series
+from core.roadmap import Roadmap
+from core.sprint_planner import DEFAULT_TIME_BUDGET, plan_sprint
+from core.velocity import analyze_velocity
+
 class ScrumManager:
     """Core Scrum management functionality"""
     
-    def __init__(self):
+    def __init__(self, data_store=None):
+        # Share the app's store so its caches serve every operation
+        if data_store is None:
+            from core.data_store import create_data_store
+            data_store = create_data_store()
+        self.data_store = data_store
+        # Last roadmap and the sprints it was planned for, refreshed in place,
+        # and the last result with the data version and settings it answered
+        self._roadmap = None
+        self._roadmap_key = None
+        self._roadmap_result = None
         self.story_statuses = ["Backlog", "To Do", "In Progress", "In Review", "Done"]
         self.priority_levels = ["Low", "Medium", "High", "Critical"]
     
@@ -56,90 +71,218 @@ class ScrumManager:
     
     def add_story_to_sprint(self, sprint_id: str, story_id: str) -> bool:
         """Add a story to a sprint"""
-        from core.data_store import DataStore
-        data_store = DataStore()
+        return self.add_stories_to_sprint(sprint_id, [story_id]) == 1
+    
+    def add_stories_to_sprint(self, sprint_id: str, story_ids: List[str]) -> int:
+        """Add several stories to a sprint with a single sprint write.
+
+        Stories already in the sprint or that do not exist are skipped.
+        Returns the number of stories added.
+        """
+        data_store = self.data_store
+        
+        stories = [data_store.get_story(story_id) for story_id in dict.fromkeys(story_ids)]
+        stories = [story for story in stories if story]
+        if not stories:
+            return 0
+        
+        added = []
+        
+        def apply_additions(sprint: Dict):
+            # Re-run from scratch if a version conflict forces a retry
+            added.clear()
+            members = set(sprint.get('stories', []))
+            for story in stories:
+                if story['id'] not in members:
+                    members.add(story['id'])
+                    sprint.setdefault('stories', []).append(story['id'])
+                    sprint['total_points'] = sprint.get('total_points', 0) + (story.get('story_points') or 0)
+                    added.append(story['id'])
         
         sprint = data_store.get_sprint(sprint_id)
-        story = data_store.get_story(story_id)
-        
-        if sprint and story:
-            if story_id not in sprint.get('stories', []):
-                sprint['stories'].append(story_id)
-                sprint['total_points'] += story.get('story_points', 0)
-                data_store.update_sprint(sprint_id, sprint)
-                return True
-        return False
+        if not sprint:
+            return 0
+        # Nothing to write if every story is already in the sprint
+        members = set(sprint.get('stories', []))
+        if all(story['id'] in members for story in stories):
+            return 0
+        
+        if not data_store.modify_sprint(sprint_id, apply_additions):
+            return 0
+        return len(added)
+    
+    def plan_sprint(self, sprint_id: str, time_budget: float = DEFAULT_TIME_BUDGET) -> Dict:
+        """Pick unfinished stories that best fill a sprint's remaining capacity.
+
+        Maximizes story points weighted by priority and keeps every picked
+        story's unfinished dependencies in the same plan.
+        """
+        data_store = self.data_store
+        
+        sprint = data_store.get_sprint(sprint_id)
+        if not sprint:
+            return {}
+        
+        in_sprint = set(sprint.get('stories', []))
+        candidates = [s for s in data_store.get_all_stories()
+                      if s.get('status') != 'Done' and s['id'] not in in_sprint]
+        capacity = sprint.get('capacity', 0) - sprint.get('total_points', 0)
+        
+        plan = plan_sprint(candidates, max(0, capacity), time_budget, data_store.get_dependency_graph())
+        plan['sprint_id'] = sprint_id
+        return plan
+    
+    def plan_roadmap(self, sprint_count: int = 6, capacity: int = None, sprint_weeks: int = 2) -> Dict:
+        """Spread the unscheduled backlog across the next ``sprint_count`` sprints.
+
+        Sprints still in Planning are used first with their remaining
+        capacity; projected sprints of ``capacity`` points (default: the
+        last sprint's capacity) fill the rest. The previous roadmap is
+        returned as is while no story or sprint was written, and otherwise
+        recomputed only from the first step a changed story affects.
+        """
+        data_store = self.data_store
+        today = datetime.now().strftime("%Y-%m-%d")
+        request_key = (data_store.get_data_version(), sprint_count, capacity, sprint_weeks, today)
+        if self._roadmap_result is not None and self._roadmap_result[0] == request_key:
+            return self._roadmap_result[1]
+        
+        all_sprints = sorted(data_store.get_all_sprints(), key=lambda s: s['start_date'])
+        future = [
+            dict(s, capacity=max(0, s.get('capacity', 0) - s.get('total_points', 0)))
+            for s in all_sprints
+            if s.get('status') == 'Planning' and s['start_date'] >= today
+        ][:sprint_count]
+        
+        default_capacity = capacity or (all_sprints[-1].get('capacity') if all_sprints else None) or 40
+        next_start = all_sprints[-1]['end_date'] if all_sprints else today
+        next_start = max(next_start, today)
+        while len(future) < sprint_count:
+            projected = self.create_sprint(f"Projected Sprint {len(future) + 1}", sprint_weeks,
+                                           next_start, default_capacity)
+            projected['projected'] = True
+            future.append(projected)
+            next_start = projected['end_date']
+        
+        sprint_key = [(s['name'], s['start_date'], s['capacity']) for s in future]
+        if self._roadmap_key != sprint_key:
+            self._roadmap = Roadmap(future)
+            self._roadmap_key = sprint_key
+        
+        scheduled = set()
+        for sprint in all_sprints:
+            if sprint.get('status') != 'Completed':
+                scheduled.update(sprint.get('stories', []))
+        backlog = [s for s in data_store.get_all_stories()
+                   if s.get('status') != 'Done' and s['id'] not in scheduled]
+        
+        roadmap = self._roadmap.refresh(backlog, data_store.get_dependency_graph())
+        result = {
+            "sprints": roadmap.allocation(),
+            "unscheduled": roadmap.unscheduled(),
+            "recomputed_stories": roadmap.last_recomputed
+        }
+        self._roadmap_result = (request_key, result)
+        return result
     
     def update_story_status(self, story_id: str, new_status: str) -> bool:
         """Update story status and handle sprint point tracking"""
-        from core.data_store import DataStore
-        data_store = DataStore()
+        data_store = self.data_store
         
-        story = data_store.get_story(story_id)
+        previous = {}
+        
+        def apply_status(story: Dict):
+            previous['status'] = story.get('status')
+            story['status'] = new_status
+            story['updated_date'] = datetime.now().isoformat()
+        
+        # Retries against the latest copy if another session saved it first
+        story = data_store.modify_story(story_id, apply_status)
         if not story:
             return False
         
-        old_status = story.get('status')
-        story['status'] = new_status
-        story['updated_date'] = datetime.now().isoformat()
+        old_status = previous['status']
+        story_points = story.get('story_points') or 0
         
-        # Update sprint points if story is in a sprint
-        current_sprint = data_store.get_current_sprint()
-        if current_sprint and story_id in current_sprint.get('stories', []):
-            story_points = story.get('story_points', 0)
-            
+        def apply_points(sprint: Dict):
             # Remove points from old status
             if old_status == "Done":
-                current_sprint['completed_points'] -= story_points
+                sprint['completed_points'] -= story_points
             
             # Add points to new status
             if new_status == "Done":
-                current_sprint['completed_points'] += story_points
-            
-            data_store.update_sprint(current_sprint['id'], current_sprint)
+                sprint['completed_points'] += story_points
+        
+        # Update sprint points if story is in a sprint; the store records the status event
+        current_sprint = data_store.get_current_sprint()
+        if current_sprint and story_id in current_sprint.get('stories', []):
+            data_store.modify_sprint(current_sprint['id'], apply_points)
         
-        data_store.update_story(story_id, story)
         return True
     
+    def update_stories_status(self, story_ids: List[str], new_status: str) -> int:
+        """Update the status of many stories with a single write per file"""
+        data_store = self.data_store
+        
+        current_sprint = data_store.get_current_sprint()
+        sprint_story_ids = set(current_sprint.get('stories', [])) if current_sprint else set()
+        points_delta = 0
+        updated_count = 0
+        
+        with data_store.transaction() as txn:
+            for story_id in story_ids:
+                stored = data_store.get_story(story_id)
+                if not stored:
+                    continue
+                
+                # Copy so a failed commit leaves the cached record untouched
+                story = dict(stored)
+                old_status = story.get('status')
+                story['status'] = new_status
+                story['updated_date'] = datetime.now().isoformat()
+                txn.save_story(story)
+                updated_count += 1
+                
+                if story_id in sprint_story_ids:
+                    story_points = story.get('story_points') or 0
+                    if old_status == "Done":
+                        points_delta -= story_points
+                    if new_status == "Done":
+                        points_delta += story_points
+            
+            if points_delta:
+                sprint = dict(current_sprint)
+                sprint['completed_points'] = sprint.get('completed_points', 0) + points_delta
+                txn.save_sprint(sprint)
+        
+        # The store records a status event for each story it saved
+        return updated_count if txn.committed else 0
+    
     def calculate_velocity(self, sprint_ids: List[str]) -> Dict:
         """Calculate team velocity based on completed sprints"""
-        from core.data_store import DataStore
-        data_store = DataStore()
+        data_store = self.data_store
         
         velocities = []
-        total_points = 0
-        
         for sprint_id in sprint_ids:
             sprint = data_store.get_sprint(sprint_id)
             if sprint and sprint.get('status') == 'Completed':
-                completed_points = sprint.get('completed_points', 0)
-                velocities.append(completed_points)
-                total_points += completed_points
+                velocities.append(sprint.get('completed_points', 0))
         
         if not velocities:
             return {"average": 0, "trend": "No data", "sprints_analyzed": 0}
         
-        average_velocity = total_points / len(velocities)
-        
-        # Calculate trend
-        if len(velocities) >= 2:
-            recent_avg = sum(velocities[-2:]) / 2
-            older_avg = sum(velocities[:-2]) / max(1, len(velocities) - 2)
-            trend = "Improving" if recent_avg > older_avg else "Declining" if recent_avg < older_avg else "Stable"
-        else:
-            trend = "Insufficient data"
+        stats = analyze_velocity(velocities)
         
         return {
-            "average": round(average_velocity, 1),
-            "trend": trend,
+            "average": round(stats['mean'], 1),
+            "trend": stats['trend'],
             "sprints_analyzed": len(velocities),
             "velocities": velocities
         }
     
     def generate_burndown_data(self, sprint_id: str) -> Dict:
         """Generate burndown chart data for a sprint"""
-        from core.data_store import DataStore
-        data_store = DataStore()
+        data_store = self.data_store
         
         sprint = data_store.get_sprint(sprint_id)
         if not sprint:
@@ -160,8 +303,10 @@ class ScrumManager:
                 "date": (start_date + timedelta(days=i)).strftime("%Y-%m-%d")
             })
         
-        # Get actual burndown data
-        actual_line = data_store.get_burndown_history(sprint_id)
+        # Read the daily snapshots, rebuilding from status changes if there are none
+        actual_line = get_burndown_series(data_store, sprint)
+        if actual_line is None:
+            actual_line = data_store.get_burndown_history(sprint_id)
         
         return {
             "ideal_line": ideal_line,
@@ -172,8 +317,7 @@ class ScrumManager:
     
     def get_sprint_progress(self, sprint_id: str) -> Dict:
         """Get detailed sprint progress information"""
-        from core.data_store import DataStore
-        data_store = DataStore()
+        data_store = self.data_store
         
         sprint = data_store.get_sprint(sprint_id)
         if not sprint:
@@ -0,0 +1,101 @@
+import json
+import os
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class JsonCodec:
+    """Compact stdlib JSON: no indentation or padding"""
+
+    name = "json"
+
+    def encode(self, data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, payload: bytes) -> Any:
+        return json.loads(payload)
+
+
+class PrettyJsonCodec(JsonCodec):
+    """Indented JSON for files people read or diff by hand"""
+
+    name = "pretty"
+
+    def encode(self, data: Any) -> bytes:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+class OrjsonCodec:
+    """JSON through orjson, several times faster than the stdlib in both directions"""
+
+    name = "orjson"
+
+    def encode(self, data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+    def decode(self, payload: bytes) -> Any:
+        return orjson.loads(payload)
+
+
+class MsgpackCodec:
+    """Binary MessagePack: smallest files, but no longer readable as text"""
+
+    name = "msgpack"
+
+    def encode(self, data: Any) -> bytes:
+        return msgpack.packb(data, use_bin_type=True)
+
+    def decode(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False)
+
+
+def available_codecs() -> Dict[str, Any]:
+    """Get every codec whose library is installed, by name"""
+    codecs = {"json": JsonCodec(), "pretty": PrettyJsonCodec()}
+    if orjson is not None:
+        codecs["orjson"] = OrjsonCodec()
+    if msgpack is not None:
+        codecs["msgpack"] = MsgpackCodec()
+    return codecs
+
+
+def get_codec(name: str = None):
+    """Get the codec named by ``name`` or the NEURALSPRINT_CODEC env var.
+
+    ``auto`` (the default) picks orjson when installed and compact stdlib
+    JSON otherwise. msgpack is only used when asked for by name, since it
+    makes the data files binary.
+    """
+    name = (name or os.getenv("NEURALSPRINT_CODEC", "auto")).strip().lower()
+    codecs = available_codecs()
+    if name == "auto":
+        return codecs.get("orjson", codecs["json"])
+    if name not in codecs:
+        raise ValueError(f"Codec '{name}' is unknown or its library is not installed")
+    return codecs[name]
+
+
+def decode_any(payload: bytes) -> Any:
+    """Decode a data file written by any codec.
+
+    JSON documents start with '[' or '{' (after optional whitespace);
+    anything else is treated as MessagePack. This lets the codec setting
+    change without converting existing files.
+    """
+    stripped = payload.lstrip()
+    if not stripped or stripped[:1] in (b'[', b'{'):
+        if orjson is not None:
+            return orjson.loads(payload)
+        return json.loads(payload)
+    if msgpack is None:
+        raise ValueError("File is not JSON and msgpack is not installed to read it")
+    return msgpack.unpackb(payload, raw=False)
@@ -0,0 +1,204 @@
+import copy
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.burndown import get_burndown_series
+from core.forecast import forecast_completion
+
+# Fewer trials than the release forecast so sliders stay responsive
+SCENARIO_TRIALS = 20_000
+
+
+class SprintScenario:
+    """What-if changes to a sprint, layered over the stored data.
+
+    Each stored story is read from the DataStore once per scenario, on
+    first use; a change works on a further copy of the story it touches,
+    so nothing is ever written back and every result reads the same data.
+    """
+
+    def __init__(self, data_store, sprint_id: str):
+        self.data_store = data_store
+        self.base_sprint = data_store.get_sprint(sprint_id)
+        if not self.base_sprint:
+            raise ValueError(f"Sprint {sprint_id} not found")
+
+        self._story_ids = list(dict.fromkeys(self.base_sprint.get('stories', [])))
+        # Stored stories by id (None if missing), and the changed copies
+        self._base_stories: Dict[str, Optional[Dict]] = {}
+        self._overrides: Dict[str, Dict] = {}
+        self._capacity: Optional[float] = None
+        self._team_size: Optional[int] = None
+        self._base_team_size: Optional[int] = None
+
+    # Hypothetical changes
+    def add_story(self, story_id: str) -> "SprintScenario":
+        """Pretend a story is in the sprint"""
+        if story_id not in self._story_ids:
+            self._story_ids.append(story_id)
+        return self
+
+    def remove_story(self, story_id: str) -> "SprintScenario":
+        """Pretend a story is not in the sprint"""
+        if story_id in self._story_ids:
+            self._story_ids.remove(story_id)
+        return self
+
+    def change_story(self, story_id: str, **changes) -> "SprintScenario":
+        """Pretend a story has different fields, e.g. story_points or status"""
+        story = self._story(story_id)
+        if story is None:
+            raise ValueError(f"Story {story_id} not found")
+        if story_id not in self._overrides:
+            story = self._overrides[story_id] = copy.deepcopy(story)
+        story.update(changes)
+        return self
+
+    def set_capacity(self, capacity: float) -> "SprintScenario":
+        """Pretend the sprint has a different capacity in points"""
+        self._capacity = capacity
+        return self
+
+    def set_team_size(self, team_size: int) -> "SprintScenario":
+        """Pretend the team has a different number of members.
+
+        Capacity (unless set explicitly) and expected velocity scale by
+        the ratio to the current team size.
+        """
+        self._team_size = team_size
+        return self
+
+    # Resolved view
+    def _base_story(self, story_id: str) -> Optional[Dict]:
+        if story_id not in self._base_stories:
+            self._base_stories[story_id] = self.data_store.get_story(story_id)
+        return self._base_stories[story_id]
+
+    def _story(self, story_id: str) -> Optional[Dict]:
+        return self._overrides.get(story_id) or self._base_story(story_id)
+
+    def stories(self) -> List[Dict]:
+        """Get the sprint's stories with the hypothetical changes applied"""
+        return [story for story in map(self._story, self._story_ids) if story]
+
+    def base_team_size(self) -> int:
+        """Number of distinct assignees on the sprint's stored stories (at least one)"""
+        if self._base_team_size is None:
+            assignees = set()
+            for story_id in self.base_sprint.get('stories', []):
+                story = self._base_story(story_id)
+                if story and story.get('assignee'):
+                    assignees.add(story['assignee'])
+            self._base_team_size = max(1, len(assignees))
+        return self._base_team_size
+
+    def team_factor(self) -> float:
+        """Ratio of the hypothetical team size to the current one"""
+        if self._team_size is None:
+            return 1.0
+        return self._team_size / self.base_team_size()
+
+    def capacity(self) -> float:
+        """Sprint capacity in points under the scenario"""
+        if self._capacity is not None:
+            return self._capacity
+        return self.base_sprint.get('capacity', 0) * self.team_factor()
+
+    def _velocities(self) -> List[float]:
+        history = [v['completed_points'] for v in self.data_store.get_velocity_history()]
+        velocities = [v for v in history if v > 0] or [self.capacity()]
+        factor = self.team_factor()
+        return [v * factor for v in velocities]
+
+    # Recomputed results
+    def progress(self) -> Dict:
+        """Get sprint progress as ScrumManager.get_sprint_progress reports it"""
+        stories = self.stories()
+        total_points = sum(s.get('story_points') or 0 for s in stories)
+        completed_points = sum(s.get('story_points') or 0 for s in stories if s.get('status') == 'Done')
+
+        story_statuses = {}
+        for story in stories:
+            status = story.get('status', 'Unknown')
+            story_statuses[status] = story_statuses.get(status, 0) + 1
+
+        end_date = datetime.fromisoformat(self.base_sprint['end_date'])
+        days_remaining = max(0, (end_date - datetime.now()).days)
+
+        return {
+            "progress_percentage": round(completed_points / total_points * 100, 1) if total_points > 0 else 0,
+            "completed_points": completed_points,
+            "total_points": total_points,
+            "remaining_points": total_points - completed_points,
+            "story_statuses": story_statuses,
+            "days_remaining": days_remaining,
+            "stories_count": len(stories),
+            "capacity": self.capacity(),
+            "over_capacity": total_points > self.capacity()
+        }
+
+    def burndown(self) -> Dict:
+        """Get the recorded burndown and a projection of the scenario to sprint end.
+
+        The projection starts today at the scenario's remaining points and
+        falls at the average historical velocity, scaled by team size.
+        """
+        sprint = self.base_sprint
+        start_date = datetime.strptime(sprint['start_date'], "%Y-%m-%d")
+        end_date = datetime.strptime(sprint['end_date'], "%Y-%m-%d")
+        sprint_days = max(1, (end_date - start_date).days)
+        progress = self.progress()
+        total_points = progress['total_points']
+
+        actual_line = get_burndown_series(self.data_store, sprint)
+        if actual_line is None:
+            actual_line = self.data_store.get_burndown_history(sprint['id'])
+
+        days = np.arange(sprint_days + 1)
+        ideal = total_points - total_points * days / sprint_days
+
+        daily_rate = float(np.mean(self._velocities())) / sprint_days
+        today = min(max(0, (datetime.now() - start_date).days), sprint_days)
+        ahead = np.arange(sprint_days - today + 1)
+        projected = np.maximum(0, progress['remaining_points'] - daily_rate * ahead)
+
+        return {
+            "ideal_line": [
+                {"day": int(i), "ideal_remaining": round(float(v), 1),
+                 "date": (start_date + timedelta(days=int(i))).strftime("%Y-%m-%d")}
+                for i, v in zip(days, ideal)
+            ],
+            "actual_line": actual_line,
+            "projected_line": [
+                {"day": today + int(i), "projected_remaining": round(float(v), 1),
+                 "date": (start_date + timedelta(days=today + int(i))).strftime("%Y-%m-%d")}
+                for i, v in zip(ahead, projected)
+            ],
+            "total_points": total_points,
+            "days_in_sprint": sprint_days
+        }
+
+    def forecast(self, trials: int = SCENARIO_TRIALS, seed: Optional[int] = None) -> Dict:
+        """Get the chance of finishing by sprint end and P50/P85/P95 finish dates"""
+        sprint = self.base_sprint
+        start_date = datetime.strptime(sprint['start_date'], "%Y-%m-%d")
+        end_date = datetime.strptime(sprint['end_date'], "%Y-%m-%d")
+        sprint_days = max(1, (end_date - start_date).days)
+        days_left = max(0, (end_date - datetime.now()).days)
+        remaining = self.progress()['remaining_points']
+        velocities = np.asarray(self._velocities(), dtype=float)
+
+        rng = np.random.default_rng(seed)
+        # Points delivered in the days left, at a velocity drawn from history
+        deliverable = velocities[rng.integers(0, len(velocities), trials)] * days_left / sprint_days
+        on_time = float(np.mean(deliverable >= remaining)) if remaining > 0 else 1.0
+
+        result = {"remaining_points": remaining, "on_time_probability": round(on_time, 3)}
+        completion = forecast_completion(remaining, velocities, sprint_weeks=sprint_days / 7,
+                                         trials=trials, seed=seed)
+        if completion:
+            for p in (50, 85, 95):
+                result[f"p{p}_date"] = completion[f"p{p}_date"]
+        return result
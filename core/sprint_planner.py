@@ -0,0 +1,225 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.dependency_graph import DependencyGraph
+
+# Value of one story point at each priority
+PRIORITY_WEIGHTS = {"Critical": 8, "High": 4, "Medium": 2, "Low": 1}
+
+# Points are planned in half-point steps
+UNITS_PER_POINT = 2
+
+# Seconds allowed for enumerating stories tied together by dependencies
+DEFAULT_TIME_BUDGET = 0.05
+
+
+def _units(story: Dict) -> Optional[int]:
+    """Story size in half points, or None if it has not been estimated"""
+    points = story.get('story_points')
+    if points is None:
+        return None
+    return max(0, int(round(float(points) * UNITS_PER_POINT)))
+
+
+def _binary_pieces(count: int) -> List[int]:
+    """Split ``count`` identical items into 1, 2, 4, ... sized pieces covering every total"""
+    pieces, size = [], 1
+    while count > 0:
+        take = min(size, count)
+        pieces.append(take)
+        count -= take
+        size *= 2
+    return pieces
+
+
+def _component_options(members: List[str], deps: Dict[str, List[str]], units: Dict[str, int],
+                       values: Dict[str, int], capacity: int, deadline: float) -> Tuple[List, bool]:
+    """Enumerate dependency-closed subsets of a component, keeping the best per size.
+
+    ``members`` must be in dependency order. Each story's own dependency
+    closure, and a greedy packing of those closures by value per point,
+    are added first, so good options exist before the exhaustive search.
+    Closures can add up to the square of the component size, so they get
+    half of the time to ``deadline``, and every stage stops there.
+    Returns the options as (units, value, ids) and whether the
+    enumeration finished.
+    """
+    best: Dict[int, Tuple[int, frozenset]] = {}
+
+    def consider(size: int, value: int, chosen: frozenset):
+        if size <= capacity and value > best.get(size, (-1, None))[0]:
+            best[size] = (value, chosen)
+
+    # A story's closure is itself plus its dependencies' closures, which come earlier
+    now = time.perf_counter()
+    closure_deadline = now + max(0.0, deadline - now) / 2
+    closures: Dict[str, Tuple[frozenset, int, int]] = {}
+    ranked = []
+    for sid in members:
+        if time.perf_counter() > closure_deadline:
+            break
+        own = deps[sid]
+        if len(own) == 1:
+            closure, size, value = closures[own[0]]
+            closure, size, value = closure | {sid}, size + units[sid], value + values[sid]
+        else:
+            closure = frozenset([sid]).union(*(closures[dep][0] for dep in own))
+            size = sum(units[n] for n in closure)
+            value = sum(values[n] for n in closure)
+        closures[sid] = (closure, size, value)
+        consider(size, value, closure)
+        ranked.append((value / max(size, 1), closure))
+
+    ranked.sort(key=lambda item: item[0], reverse=True)
+    packed, packed_size, packed_value = set(), 0, 0
+    for _, closure in ranked:
+        if time.perf_counter() > deadline:
+            break
+        new = closure - packed
+        size = sum(units[n] for n in new)
+        if new and packed_size + size <= capacity:
+            packed |= new
+            packed_size += size
+            packed_value += sum(values[n] for n in new)
+    consider(packed_size, packed_value, frozenset(packed))
+
+    # Depth-first include/exclude over the members in dependency order
+    complete = True
+    stack = [(0, 0, 0, frozenset())]
+    while stack:
+        if time.perf_counter() > deadline:
+            complete = False
+            break
+        index, size, value, chosen = stack.pop()
+        if index == len(members):
+            continue
+        sid = members[index]
+        stack.append((index + 1, size, value, chosen))
+        if all(dep in chosen for dep in deps[sid]):
+            new_size = size + units[sid]
+            if new_size <= capacity:
+                new_chosen = chosen | {sid}
+                consider(new_size, value + values[sid], new_chosen)
+                stack.append((index + 1, new_size, value + values[sid], new_chosen))
+
+    return [(size, value, chosen) for size, (value, chosen) in best.items()], complete
+
+
+def plan_sprint(stories: List[Dict], capacity: float, time_budget: float = DEFAULT_TIME_BUDGET,
+                graph: Optional[DependencyGraph] = None) -> Dict:
+    """Pick the stories that fit ``capacity`` with the highest priority-weighted value.
+
+    ``stories`` are the candidates: every unfinished story not already in
+    the sprint. A story is only picked together with those of its
+    dependencies that are candidates too; dependencies outside the list
+    count as done. Unestimated stories, and stories depending on them or
+    on a cycle, are never picked. ``graph`` is the store's dependency
+    graph; one is built from ``stories`` if it is not given.
+
+    Independent stories are grouped by size and priority and solved as a
+    bounded knapsack; stories linked by dependencies contribute one option
+    per dependency-closed subset. A multiple-choice knapsack DP over half
+    points then combines everything.
+    """
+    deadline = time.perf_counter() + time_budget
+    capacity_units = max(0, int(capacity * UNITS_PER_POINT + 1e-9))
+    by_id = {s['id']: s for s in stories}
+    if graph is None:
+        graph = DependencyGraph.build(stories)
+    deps = {sid: [d for d in graph.dependencies(sid) if d in by_id] for sid in by_id}
+
+    order = graph.topological_order(by_id)
+    units, values = {}, {}
+    for sid in order:
+        size = _units(by_id[sid])
+        if size is not None and all(dep in units for dep in deps[sid]):
+            units[sid] = size
+            weight = PRIORITY_WEIGHTS.get(by_id[sid].get('priority'), PRIORITY_WEIGHTS["Medium"])
+            values[sid] = weight * size
+    plannable = [sid for sid in order if sid in units]
+
+    # Union stories linked by dependencies into components
+    parent = {sid: sid for sid in plannable}
+
+    def find(sid: str) -> str:
+        while parent[sid] != sid:
+            parent[sid] = parent[parent[sid]]
+            sid = parent[sid]
+        return sid
+
+    for sid in plannable:
+        for dep in deps[sid]:
+            parent[find(sid)] = find(dep)
+
+    components: Dict[str, List[str]] = {}
+    for sid in plannable:
+        components.setdefault(find(sid), []).append(sid)
+
+    # Each group offers options (units, value, ids); at most one is taken
+    groups: List[List[Tuple[int, int, List[str]]]] = []
+    free_classes: Dict[Tuple[int, int], List[str]] = {}
+    linked = []
+    for members in components.values():
+        if len(members) > 1:
+            linked.append(members)
+            continue
+        sid = members[0]
+        if 0 < units[sid] <= capacity_units:
+            free_classes.setdefault((units[sid], values[sid]), []).append(sid)
+    
+    optimal = True
+    for position, members in enumerate(linked):
+        # Share what is left of the budget evenly among the components still to search,
+        # so one large component cannot starve the rest
+        now = time.perf_counter()
+        component_deadline = now + max(0.0, deadline - now) / (len(linked) - position)
+        options, complete = _component_options(members, deps, units, values, capacity_units,
+                                               component_deadline)
+        optimal = optimal and complete
+        groups.append([(size, value, list(chosen)) for size, value, chosen in options if size > 0])
+
+    for (size, value), ids in free_classes.items():
+        taken = 0
+        for piece in _binary_pieces(min(len(ids), capacity_units // size)):
+            groups.append([(size * piece, value * piece, ids[taken:taken + piece])])
+            taken += piece
+
+    # Multiple-choice knapsack: best[c] is the top value within c half points
+    best = np.zeros(capacity_units + 1, dtype=np.int64)
+    choices = []
+    for options in groups:
+        updated = best.copy()
+        choice = np.full(capacity_units + 1, -1, dtype=np.int32)
+        for index, (size, value, _) in enumerate(options):
+            if size > capacity_units:
+                continue
+            candidate = np.full(capacity_units + 1, -1, dtype=np.int64)
+            candidate[size:] = best[:capacity_units + 1 - size] + value
+            improved = candidate > updated
+            updated[improved] = candidate[improved]
+            choice[improved] = index
+        best = updated
+        choices.append(choice)
+
+    picked = set()
+    remaining = capacity_units
+    for options, choice in zip(reversed(groups), reversed(choices)):
+        index = choice[remaining]
+        if index >= 0:
+            size, _, ids = options[index]
+            picked.update(ids)
+            remaining -= size
+
+    story_ids = [sid for sid in plannable if sid in picked]
+    total_units = sum(units[sid] for sid in story_ids)
+    return {
+        "story_ids": story_ids,
+        "total_points": total_units / UNITS_PER_POINT,
+        "total_value": int(best[capacity_units]),
+        "capacity": capacity,
+        "remaining_capacity": capacity - total_units / UNITS_PER_POINT,
+        "optimal": optimal,
+        "unplannable": len(by_id) - len(plannable)
+    }
@@ -0,0 +1,520 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+import streamlit as st
+
+from core.activity_log import ActivityLog
+from core.data_store import DataStore, _check_version
+from core.dependency_graph import DependencyGraph
+from core.file_lock import lock_stats
+from core.serializers import decode_any
+from core.story_index import INDEXED_FIELDS, FilterValue, filter_values
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stories (
+    id TEXT PRIMARY KEY,
+    status TEXT,
+    priority TEXT,
+    assignee TEXT,
+    sprint_id TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_stories_status ON stories(status);
+CREATE INDEX IF NOT EXISTS idx_stories_priority ON stories(priority);
+CREATE INDEX IF NOT EXISTS idx_stories_assignee ON stories(assignee);
+CREATE INDEX IF NOT EXISTS idx_stories_sprint ON stories(sprint_id);
+
+CREATE TABLE IF NOT EXISTS story_labels (
+    story_id TEXT NOT NULL,
+    label TEXT NOT NULL,
+    PRIMARY KEY (story_id, label)
+);
+CREATE INDEX IF NOT EXISTS idx_story_labels_label ON story_labels(label);
+
+-- Per-status story counts kept current by triggers; '' stands for no status
+CREATE TABLE IF NOT EXISTS story_status_counts (
+    status TEXT PRIMARY KEY,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sprints (
+    id TEXT PRIMARY KEY,
+    status TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sprints_status ON sprints(status);
+
+CREATE TABLE IF NOT EXISTS activities (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT NOT NULL
+);
+"""
+
+# The counter row for a status is created on first use. Plain INSERT ... WHERE
+# NOT EXISTS is used because an OR IGNORE inside a trigger is overridden by
+# the conflict handling of the upsert that fires it.
+STATUS_COUNT_TRIGGERS = """
+CREATE TRIGGER IF NOT EXISTS trg_stories_count_insert AFTER INSERT ON stories
+BEGIN
+    INSERT INTO story_status_counts (status, count)
+        SELECT COALESCE(NEW.status, ''), 0
+        WHERE NOT EXISTS (SELECT 1 FROM story_status_counts WHERE status = COALESCE(NEW.status, ''));
+    UPDATE story_status_counts SET count = count + 1 WHERE status = COALESCE(NEW.status, '');
+END;
+CREATE TRIGGER IF NOT EXISTS trg_stories_count_delete AFTER DELETE ON stories
+BEGIN
+    UPDATE story_status_counts SET count = count - 1 WHERE status = COALESCE(OLD.status, '');
+END;
+CREATE TRIGGER IF NOT EXISTS trg_stories_count_update AFTER UPDATE OF status ON stories
+WHEN COALESCE(OLD.status, '') != COALESCE(NEW.status, '')
+BEGIN
+    UPDATE story_status_counts SET count = count - 1 WHERE status = COALESCE(OLD.status, '');
+    INSERT INTO story_status_counts (status, count)
+        SELECT COALESCE(NEW.status, ''), 0
+        WHERE NOT EXISTS (SELECT 1 FROM story_status_counts WHERE status = COALESCE(NEW.status, ''));
+    UPDATE story_status_counts SET count = count + 1 WHERE status = COALESCE(NEW.status, '');
+END;
+"""
+
+# Bumped whenever existing databases need a data upgrade
+SCHEMA_VERSION = 3
+
+# Matches the JSON backend, which keeps the newest 100 activities
+MAX_ACTIVITIES = 100
+
+
+class SQLiteDataStore(DataStore):
+    """SQLite-backed storage with the same public API as DataStore.
+
+    Rows are upserted individually instead of rewriting whole files. The
+    full record is kept as JSON in ``data`` alongside indexed columns for
+    the fields the app filters on.
+    """
+
+    def __init__(self, db_path: str = None):
+        super().__init__()
+        self.db_path = db_path or os.getenv(
+            "NEURALSPRINT_DB_PATH", os.path.join(self.data_dir, "neuralsprint.db")
+        )
+        # sqlite3 connections cannot be shared between Streamlit threads
+        self._local = threading.local()
+
+        is_new = not os.path.exists(self.db_path)
+        self._connect().executescript(SCHEMA)
+        self._upgrade_schema()
+        self._connect().executescript(STATUS_COUNT_TRIGGERS)
+        if is_new:
+            migrate_json_to_sqlite(self.data_dir, self.db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _upgrade_schema(self):
+        """Backfill data for tables added after a database was created"""
+        conn = self._connect()
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= SCHEMA_VERSION:
+            return
+
+        with conn:
+            if version < 1:
+                # story_labels arrived with the secondary story indexes
+                for (data,) in conn.execute("SELECT data FROM stories").fetchall():
+                    _write_labels(conn, json.loads(data))
+            if version < 2:
+                # story_status_counts arrived with the quick-stats counters
+                conn.execute("DELETE FROM story_status_counts")
+                conn.execute(
+                    "INSERT INTO story_status_counts (status, count) "
+                    "SELECT COALESCE(status, ''), COUNT(*) FROM stories GROUP BY COALESCE(status, '')"
+                )
+            if version < 3:
+                # Version 2 triggers relied on INSERT OR IGNORE and failed on status
+                # changes; drop them so the fixed ones are created below
+                for trigger in ("trg_stories_count_insert", "trg_stories_count_update"):
+                    conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _begin_write(self, conn: sqlite3.Connection):
+        """Start a write transaction, recording how long the database lock took"""
+        started = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        lock_stats.record(time.perf_counter() - started)
+
+    def _write_versioned(self, table: str, record: Dict, upsert) -> Optional[Dict]:
+        """Check and bump a record's version and upsert it in one transaction.
+
+        Returns the stored record it replaced, or None for a new one. Raises
+        VersionConflictError if the stored version is newer than the record's.
+        """
+        conn = self._connect()
+        self._begin_write(conn)
+        try:
+            row = conn.execute(f"SELECT data FROM {table} WHERE id = ?", (record['id'],)).fetchone()
+            stored = json.loads(row[0]) if row is not None else None
+            if stored is not None:
+                _check_version(stored, record)
+                record['version'] = stored.get('version', 0) + 1
+            else:
+                record['version'] = 1
+            upsert(conn, record)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        return stored
+
+    def _fetch_records(self, query: str, params: tuple = ()) -> List[Dict]:
+        """Run a query selecting ``data`` and decode each row"""
+        try:
+            rows = self._connect().execute(query, params).fetchall()
+            return [json.loads(row[0]) for row in rows]
+        except sqlite3.Error as e:
+            st.error(f"Error reading {self.db_path}: {str(e)}")
+            return []
+
+    # Story management
+    def _write_story(self, story: Dict) -> bool:
+        """Persist a story, raising VersionConflictError if it is stale"""
+        try:
+            previous = self._write_versioned("stories", story, _upsert_story)
+        except sqlite3.Error as e:
+            st.error(f"Error saving story {story['id']}: {str(e)}")
+            return False
+
+        self._log_activity("Story", f"{'Updated' if previous is not None else 'Created'} story: {story['title']}")
+        self._record_status_events([(story, previous)])
+        return True
+
+    def get_story(self, story_id: str) -> Optional[Dict]:
+        """Get a specific story by ID"""
+        records = self._fetch_records("SELECT data FROM stories WHERE id = ?", (story_id,))
+        return records[0] if records else None
+
+    def get_all_stories(self) -> List[Dict]:
+        """Get all stories"""
+        return self._fetch_records("SELECT data FROM stories ORDER BY rowid")
+
+    def get_data_version(self) -> str:
+        """Get a token that changes whenever stories or sprints are written.
+
+        Every write logs an activity, and activity sequence numbers only grow.
+        """
+        row = self._connect().execute("SELECT COALESCE(MAX(seq), 0) FROM activities").fetchone()
+        return str(row[0])
+
+    def get_dependency_graph(self) -> DependencyGraph:
+        """Get the dependency graph over all stories, built from the current rows"""
+        return DependencyGraph.build(self.get_all_stories())
+
+    def delete_story(self, story_id: str) -> bool:
+        """Delete a story"""
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM stories WHERE id = ?", (story_id,))
+                conn.execute("DELETE FROM story_labels WHERE story_id = ?", (story_id,))
+        except sqlite3.Error as e:
+            st.error(f"Error deleting story {story_id}: {str(e)}")
+            return False
+
+        self._log_activity("Story", f"Deleted story: {story_id}")
+        return True
+
+    def _story_filter(self, status: FilterValue, priority: FilterValue,
+                      assignee: FilterValue, label: FilterValue):
+        """Build a WHERE clause and parameters for the story filters"""
+        clauses = []
+        params = []
+        for column, value in (("status", status), ("priority", priority), ("assignee", assignee)):
+            values = filter_values(value)
+            if values is not None:
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+
+        labels = filter_values(label)
+        if labels is not None:
+            clauses.append(
+                f"id IN (SELECT story_id FROM story_labels WHERE label IN ({', '.join('?' * len(labels))}))"
+            )
+            params.extend(labels)
+
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, tuple(params)
+
+    def query_stories(self, status: FilterValue = None, priority: FilterValue = None,
+                      assignee: FilterValue = None, label: FilterValue = None) -> List[Dict]:
+        """Get stories matching every given filter, in backlog order"""
+        where, params = self._story_filter(status, priority, assignee, label)
+        return self._fetch_records(f"SELECT data FROM stories{where} ORDER BY rowid", params)
+
+    def count_stories(self, status: FilterValue = None, priority: FilterValue = None,
+                      assignee: FilterValue = None, label: FilterValue = None) -> int:
+        """Count stories matching every given filter"""
+        where, params = self._story_filter(status, priority, assignee, label)
+        try:
+            return self._connect().execute(f"SELECT COUNT(*) FROM stories{where}", params).fetchone()[0]
+        except sqlite3.Error as e:
+            st.error(f"Error reading {self.db_path}: {str(e)}")
+            return 0
+
+    def count_stories_by(self, field: str) -> Dict:
+        """Count stories per value of status, priority, assignee or label"""
+        if field not in INDEXED_FIELDS:
+            raise ValueError(f"Cannot count stories by {field}")
+        if field == "status":
+            # Trigger-maintained counters, so this never scans the stories
+            query = "SELECT NULLIF(status, ''), count FROM story_status_counts WHERE count > 0"
+        elif field == "label":
+            query = "SELECT label, COUNT(*) FROM story_labels GROUP BY label"
+        else:
+            query = f"SELECT {field}, COUNT(*) FROM stories GROUP BY {field}"
+        try:
+            return dict(self._connect().execute(query).fetchall())
+        except sqlite3.Error as e:
+            st.error(f"Error reading {self.db_path}: {str(e)}")
+            return {}
+
+    def _get_stats(self) -> Dict:
+        """Get dashboard counters from the status-count table and active sprint"""
+        counts = self.count_stories_by('status')
+        current_sprint = self.get_current_sprint()
+        return {
+            "status_counts": {status: n for status, n in counts.items() if status is not None},
+            "total_stories": sum(counts.values()),
+            "current_sprint": current_sprint
+        }
+
+    # Sprint management
+    def _write_sprint(self, sprint: Dict) -> bool:
+        """Persist a sprint, raising VersionConflictError if it is stale"""
+        try:
+            updated = self._write_versioned("sprints", sprint, _upsert_sprint) is not None
+        except sqlite3.Error as e:
+            st.error(f"Error saving sprint {sprint['id']}: {str(e)}")
+            return False
+
+        self._log_activity("Sprint", f"{'Updated' if updated else 'Created'} sprint: {sprint['name']}")
+        return True
+
+    def get_sprint(self, sprint_id: str) -> Optional[Dict]:
+        """Get a specific sprint by ID"""
+        records = self._fetch_records("SELECT data FROM sprints WHERE id = ?", (sprint_id,))
+        return records[0] if records else None
+
+    def get_all_sprints(self) -> List[Dict]:
+        """Get all sprints"""
+        return self._fetch_records("SELECT data FROM sprints ORDER BY rowid")
+
+    def get_current_sprint(self) -> Optional[Dict]:
+        """Get the currently active sprint"""
+        records = self._fetch_records(
+            "SELECT data FROM sprints WHERE status = 'Active' ORDER BY rowid LIMIT 1"
+        )
+        return records[0] if records else None
+
+    # Batched writes
+    def _commit_transaction(self, txn) -> Optional[List[Dict]]:
+        """Persist a transaction in one SQLite transaction"""
+        conn = self._connect()
+        activities = []
+        try:
+            self._begin_write(conn)
+            try:
+                # Check every version before bumping any, so a conflict
+                # leaves the caller's records untouched
+                next_versions = []
+                previous = {}
+                for table, records in (("stories", txn.stories), ("sprints", txn.sprints)):
+                    for record in records.values():
+                        row = conn.execute(f"SELECT data FROM {table} WHERE id = ?", (record['id'],)).fetchone()
+                        stored = json.loads(row[0]) if row is not None else {}
+                        if row is not None:
+                            _check_version(stored, record)
+                        if table == "stories":
+                            previous[record['id']] = stored if row is not None else None
+                        next_versions.append((record, stored.get('version', 0) + 1))
+                for record, version in next_versions:
+                    record['version'] = version
+
+                for story in txn.stories.values():
+                    _upsert_story(conn, story)
+                deleted = [(story_id,) for story_id in txn.deleted_stories]
+                conn.executemany("DELETE FROM stories WHERE id = ?", deleted)
+                conn.executemany("DELETE FROM story_labels WHERE story_id = ?", deleted)
+                for sprint in txn.sprints.values():
+                    _upsert_sprint(conn, sprint)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        except sqlite3.Error as e:
+            st.error(f"Error saving changes: {str(e)}")
+            return None
+
+        for story in txn.stories.values():
+            verb = "Updated" if story['version'] > 1 else "Created"
+            activities.append(self._make_activity("Story", f"{verb} story: {story['title']}"))
+        for story_id in txn.deleted_stories:
+            activities.append(self._make_activity("Story", f"Deleted story: {story_id}"))
+        for sprint in txn.sprints.values():
+            verb = "Updated" if sprint['version'] > 1 else "Created"
+            activities.append(self._make_activity("Sprint", f"{verb} sprint: {sprint['name']}"))
+        self._record_status_events((story, previous[story_id]) for story_id, story in txn.stories.items())
+        return activities
+
+    # Activity logging
+    def _log_activities(self, activities: List[Dict]):
+        """Insert activity entries in one transaction, keeping the newest 100"""
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = None
+                for activity in activities:
+                    cursor = conn.execute(
+                        "INSERT INTO activities (data) VALUES (?)", (json.dumps(activity),)
+                    )
+                if cursor is not None:
+                    conn.execute(
+                        "DELETE FROM activities WHERE seq <= ?", (cursor.lastrowid - MAX_ACTIVITIES,)
+                    )
+        except sqlite3.Error as e:
+            st.error(f"Error logging activity: {str(e)}")
+
+    def get_recent_activities(self, limit: int = 10) -> List[Dict]:
+        """Get recent activities"""
+        return self._fetch_records(
+            "SELECT data FROM activities ORDER BY seq DESC LIMIT ?", (limit,)
+        )
+
+
+def _upsert_story(conn: sqlite3.Connection, story: Dict):
+    """Insert or update one story row, keeping its rowid (and so its order)"""
+    conn.execute(
+        """
+        INSERT INTO stories (id, status, priority, assignee, sprint_id, data)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET
+            status = excluded.status,
+            priority = excluded.priority,
+            assignee = excluded.assignee,
+            sprint_id = COALESCE(excluded.sprint_id, stories.sprint_id),
+            data = excluded.data
+        """,
+        (
+            story['id'],
+            story.get('status'),
+            story.get('priority'),
+            story.get('assignee'),
+            story.get('sprint_id'),
+            json.dumps(story, ensure_ascii=False)
+        )
+    )
+    _write_labels(conn, story)
+
+
+def _write_labels(conn: sqlite3.Connection, story: Dict):
+    """Replace the label rows for one story"""
+    conn.execute("DELETE FROM story_labels WHERE story_id = ?", (story['id'],))
+    conn.executemany(
+        "INSERT OR IGNORE INTO story_labels (story_id, label) VALUES (?, ?)",
+        [(story['id'], label) for label in story.get('labels') or []]
+    )
+
+
+def _upsert_sprint(conn: sqlite3.Connection, sprint: Dict):
+    """Insert or update one sprint row and tag its member stories"""
+    conn.execute(
+        """
+        INSERT INTO sprints (id, status, data) VALUES (?, ?, ?)
+        ON CONFLICT(id) DO UPDATE SET status = excluded.status, data = excluded.data
+        """,
+        (sprint['id'], sprint.get('status'), json.dumps(sprint, ensure_ascii=False))
+    )
+
+    # Stories only know their sprint through the sprint's member list
+    conn.execute(
+        "UPDATE stories SET sprint_id = NULL WHERE sprint_id = ?", (sprint['id'],)
+    )
+    conn.executemany(
+        "UPDATE stories SET sprint_id = ? WHERE id = ?",
+        [(sprint['id'], story_id) for story_id in sprint.get('stories', [])]
+    )
+
+
+def migrate_json_to_sqlite(data_dir: str = "data", db_path: str = None) -> Dict:
+    """Copy stories.json, sprints.json and the activity log into a SQLite database.
+
+    Activities come from activities.jsonl when it exists, otherwise from
+    the legacy activities.json.
+
+    Existing rows with the same ids are overwritten and activities are only
+    copied into an empty table, so running it again is harmless. Returns
+    the number of records migrated per file.
+    """
+    db_path = db_path or os.path.join(data_dir, "neuralsprint.db")
+
+    def load(name: str) -> List[Dict]:
+        path = os.path.join(data_dir, name)
+        if not os.path.exists(path):
+            return []
+        # Data files may have been written with any NEURALSPRINT_CODEC
+        with open(path, 'rb') as f:
+            return decode_any(f.read())
+
+    stories = load("stories.json")
+    sprints = load("sprints.json")
+    activity_log_path = os.path.join(data_dir, "activities.jsonl")
+    if os.path.exists(activity_log_path):
+        activities = ActivityLog(activity_log_path).recent(MAX_ACTIVITIES)
+    else:
+        activities = load("activities.json")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        with conn:
+            for story in stories:
+                _upsert_story(conn, story)
+            for sprint in sprints:
+                _upsert_sprint(conn, sprint)
+            if conn.execute("SELECT COUNT(*) FROM activities").fetchone()[0] == 0:
+                # activities.json is newest first; the table is oldest first
+                conn.executemany(
+                    "INSERT INTO activities (data) VALUES (?)",
+                    [(json.dumps(activity, ensure_ascii=False),)
+                     for activity in reversed(activities[:MAX_ACTIVITIES])]
+                )
+            else:
+                activities = []
+    finally:
+        conn.close()
+
+    return {
+        "stories": len(stories),
+        "sprints": len(sprints),
+        "activities": min(len(activities), MAX_ACTIVITIES)
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Migrate NeuralSprint JSON data to SQLite")
+    parser.add_argument("--data-dir", default="data")
+    parser.add_argument("--db-path", default=None)
+    args = parser.parse_args()
+
+    counts = migrate_json_to_sqlite(args.data_dir, args.db_path)
+    print(f"Migrated {counts['stories']} stories, {counts['sprints']} sprints "
+          f"and {counts['activities']} activities")
@@ -0,0 +1,178 @@
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from core.file_lock import file_lock
+
+# Statuses that mean work on a story has not started yet
+NOT_STARTED = ("Backlog", "To Do")
+DONE = "Done"
+
+
+def make_status_event(story: Dict, old_status: Optional[str], new_status: str,
+                      sprint_id: Optional[str] = None) -> Dict:
+    """Build the event recorded when a story moves between statuses"""
+    return {
+        "story_id": story['id'],
+        "from": old_status,
+        "to": new_status,
+        "at": datetime.now().isoformat(),
+        "points": story.get('story_points') or 0,
+        "sprint_id": sprint_id,
+        "created": story.get('created_date')
+    }
+
+
+class StoryEventLog:
+    """Append-only JSONL stream of story status transitions, oldest first"""
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+
+    def extend(self, events: List[Dict]):
+        """Append several events in a single write"""
+        if not events:
+            return
+        payload = "".join(json.dumps(e, ensure_ascii=False) + "\n" for e in events)
+        with file_lock(self.file_path):
+            with open(self.file_path, 'a', encoding='utf-8') as f:
+                f.write(payload)
+
+    def read_from(self, offset: int) -> Tuple[List[Dict], int]:
+        """Read complete events written after byte ``offset``.
+
+        Returns the events and the offset to resume from. A trailing line
+        without its newline is still being written and is left for later.
+        """
+        with open(self.file_path, 'rb') as f:
+            f.seek(offset)
+            chunk = f.read()
+
+        end = chunk.rfind(b"\n") + 1
+        events = []
+        for line in chunk[:end].split(b"\n"):
+            if not line.strip():
+                continue
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events, offset + end
+
+
+class StatusProjection:
+    """Running fold of the event stream into burndown, cycle and lead times.
+
+    Only events past ``offset`` are applied on refresh, so a page view
+    costs the events written since the last one rather than the history.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.offset = 0
+        self._stories: Dict[str, Dict] = {}
+        # sprint id -> date -> net points completed that day
+        self._sprint_days: Dict[str, Dict[str, float]] = {}
+        # story id -> days, for stories currently Done
+        self._cycle_times: Dict[str, float] = {}
+        self._lead_times: Dict[str, float] = {}
+        self._cycle_total = 0.0
+        self._lead_total = 0.0
+
+    def refresh(self, log: StoryEventLog):
+        """Apply events appended to ``log`` since the last refresh"""
+        with self._lock:
+            if not os.path.exists(log.file_path):
+                if self.offset:
+                    self._reset()
+                return
+            if os.path.getsize(log.file_path) < self.offset:
+                # The log was replaced or truncated: start over
+                self._reset()
+            events, self.offset = log.read_from(self.offset)
+            for event in events:
+                self._apply(event)
+
+    def _apply(self, event: Dict):
+        story_id = event.get('story_id')
+        old_status, new_status = event.get('from'), event.get('to')
+        if not story_id or old_status == new_status:
+            return
+
+        try:
+            at = datetime.fromisoformat(event['at'])
+        except (KeyError, TypeError, ValueError):
+            return
+        day = at.strftime("%Y-%m-%d")
+        points = event.get('points') or 0
+        state = self._stories.setdefault(story_id, {})
+        if event.get('created') and 'created' not in state:
+            state['created'] = event['created']
+
+        if old_status == DONE:
+            self._add_sprint_points(event.get('sprint_id'), day, -points)
+            self._cycle_total -= self._cycle_times.pop(story_id, 0.0)
+            self._lead_total -= self._lead_times.pop(story_id, 0.0)
+
+        if new_status not in NOT_STARTED and 'started' not in state:
+            state['started'] = at
+
+        if new_status == DONE:
+            self._add_sprint_points(event.get('sprint_id'), day, points)
+            if 'started' in state:
+                cycle_days = (at - state['started']).total_seconds() / 86400
+                self._cycle_times[story_id] = cycle_days
+                self._cycle_total += cycle_days
+            lead_days = self._days_since(state.get('created'), at)
+            if lead_days is not None:
+                self._lead_times[story_id] = lead_days
+                self._lead_total += lead_days
+
+    def _add_sprint_points(self, sprint_id: Optional[str], day: str, points: float):
+        if sprint_id:
+            days = self._sprint_days.setdefault(sprint_id, {})
+            days[day] = days.get(day, 0) + points
+
+    @staticmethod
+    def _days_since(created: Optional[str], at: datetime) -> Optional[float]:
+        try:
+            return max(0.0, (at - datetime.fromisoformat(created)).total_seconds() / 86400)
+        except (TypeError, ValueError):
+            return None
+
+    def completed_by_day(self, sprint_id: str) -> Dict[str, float]:
+        """Get net story points completed per date for a sprint"""
+        with self._lock:
+            return dict(self._sprint_days.get(sprint_id, {}))
+
+    def avg_cycle_time(self) -> float:
+        """Average days from work starting to Done, over stories now Done"""
+        with self._lock:
+            if not self._cycle_times:
+                return 0.0
+            return round(self._cycle_total / len(self._cycle_times), 1)
+
+    def avg_lead_time(self) -> float:
+        """Average days from creation to Done, over stories now Done"""
+        with self._lock:
+            if not self._lead_times:
+                return 0.0
+            return round(self._lead_total / len(self._lead_times), 1)
+
+
+_projections: Dict[str, StatusProjection] = {}
+_projections_guard = threading.Lock()
+
+
+def status_projection(log: StoryEventLog) -> StatusProjection:
+    """Get the process-wide projection for a log, caught up to its end"""
+    path = os.path.abspath(log.file_path)
+    with _projections_guard:
+        projection = _projections.setdefault(path, StatusProjection())
+    projection.refresh(log)
+    return projection
@@ -0,0 +1,123 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+# Filter value: one value, or any of several values
+FilterValue = Union[str, Iterable[str], None]
+
+INDEXED_FIELDS = ("status", "priority", "assignee", "label")
+
+
+def filter_values(value: FilterValue) -> Optional[Set]:
+    """Normalise a filter value to a set of accepted values, or None for no filter"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return {value}
+    return set(value)
+
+
+class StoryIndex:
+    """Secondary indexes over stories by status, priority, assignee and label.
+
+    Each record's indexed values are remembered by id, so an update removes
+    the old entries even if the caller mutated the stored dict in place.
+    """
+
+    def __init__(self):
+        self._keys: Dict[str, Tuple] = {}
+        self._buckets: Dict[str, Dict[str, Set[str]]] = {field: {} for field in INDEXED_FIELDS}
+
+    @classmethod
+    def build(cls, stories: List[Dict]) -> "StoryIndex":
+        """Index a full list of stories"""
+        index = cls()
+        for story in stories:
+            index.update(story)
+        return index
+
+    def copy(self) -> "StoryIndex":
+        """Get an independent copy to update without touching this one"""
+        index = StoryIndex()
+        index._keys = dict(self._keys)
+        index._buckets = {field: {value: set(ids) for value, ids in buckets.items()}
+                          for field, buckets in self._buckets.items()}
+        return index
+
+    @staticmethod
+    def _key_of(story: Dict) -> Tuple:
+        return (
+            story.get('status'),
+            story.get('priority'),
+            story.get('assignee'),
+            tuple(sorted(set(story.get('labels') or [])))
+        )
+
+    def update(self, story: Dict):
+        """Add a story or move it to the buckets for its current values"""
+        key = self._key_of(story)
+        old_key = self._keys.get(story['id'])
+        if old_key == key:
+            return
+        if old_key is not None:
+            self._unlink(story['id'], old_key)
+
+        self._keys[story['id']] = key
+        status, priority, assignee, labels = key
+        self._buckets["status"].setdefault(status, set()).add(story['id'])
+        self._buckets["priority"].setdefault(priority, set()).add(story['id'])
+        self._buckets["assignee"].setdefault(assignee, set()).add(story['id'])
+        for label in labels:
+            self._buckets["label"].setdefault(label, set()).add(story['id'])
+
+    def remove(self, story_id: str):
+        """Drop a story from every index"""
+        old_key = self._keys.pop(story_id, None)
+        if old_key is not None:
+            self._unlink(story_id, old_key)
+
+    def _unlink(self, story_id: str, key: Tuple):
+        status, priority, assignee, labels = key
+        self._discard("status", status, story_id)
+        self._discard("priority", priority, story_id)
+        self._discard("assignee", assignee, story_id)
+        for label in labels:
+            self._discard("label", label, story_id)
+
+    def _discard(self, field: str, value, story_id: str):
+        bucket = self._buckets[field].get(value)
+        if bucket is not None:
+            bucket.discard(story_id)
+            if not bucket:
+                del self._buckets[field][value]
+
+    def ids(self, status: FilterValue = None, priority: FilterValue = None,
+            assignee: FilterValue = None, label: FilterValue = None) -> Set[str]:
+        """Get the ids matching every given filter.
+
+        Starts from the smallest candidate set, so the cost follows the
+        result size rather than the number of stories.
+        """
+        candidate_sets = []
+        for field, value in (("status", status), ("priority", priority),
+                             ("assignee", assignee), ("label", label)):
+            values = filter_values(value)
+            if values is None:
+                continue
+            buckets = [self._buckets[field].get(v, ()) for v in values]
+            if len(buckets) == 1:
+                candidate_sets.append(buckets[0])
+            else:
+                candidate_sets.append(set().union(*buckets))
+
+        if not candidate_sets:
+            return set(self._keys)
+
+        candidate_sets.sort(key=len)
+        smallest, rest = candidate_sets[0], candidate_sets[1:]
+        return {story_id for story_id in smallest if all(story_id in s for s in rest)}
+
+    def counts(self, field: str) -> Dict:
+        """Get the number of stories per value of an indexed field"""
+        return {value: len(ids) for value, ids in self._buckets[field].items()}
+
+    def __len__(self) -> int:
+        return len(self._keys)
@@ -0,0 +1,146 @@
+import re
+from typing import Iterable, Iterator
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+
+# Phrases that open a stretch of the model reasoning out loud. The stretch
+# runs to a blank line, a new line starting with a letter, or the end.
+PREAMBLES = (
+    "let me think about this",
+    "okay, let's tackle this",
+    "i need to analyze",
+    "first, i'll",
+    "let me structure",
+    "wait,",
+)
+
+# Tokens that switch the filter out of plain text, longest first so a
+# shared prefix resolves to the longer one
+_START_TOKENS = tuple(sorted((THINK_OPEN,) + PREAMBLES, key=len, reverse=True))
+_START = re.compile("|".join(re.escape(token) for token in _START_TOKENS), re.IGNORECASE)
+_THINK_CLOSE = re.compile(re.escape(THINK_CLOSE), re.IGNORECASE)
+_THINK_OPEN = re.compile(re.escape(THINK_OPEN), re.IGNORECASE)
+# The newline ending a preamble stays in the text
+_PREAMBLE_END = re.compile(r"\n(?=\n|[a-z])", re.IGNORECASE)
+# A whitespace run holding three or more newlines becomes one blank line
+_BLANK_RUN = re.compile(r"\n(?:[^\S\n]*\n){2,}")
+
+TEXT, THINK, PREAMBLE = "text", "think", "preamble"
+
+
+def _partial_suffix(text: str, tokens: Iterable[str]) -> int:
+    """Length of the longest end of ``text`` that could begin one of ``tokens``"""
+    lowered = text[-max(len(token) for token in tokens):].lower()
+    for size in range(len(lowered), 0, -1):
+        if any(len(token) > size and token.startswith(lowered[-size:]) for token in tokens):
+            return size
+    return 0
+
+
+class ThinkFilter:
+    """Strips thinking from a response as it streams in.
+
+    A small state machine over the chunks: plain text is shown,
+    ``<think>...</think>`` spans are dropped, and so is each reasoning
+    preamble (see ``PREAMBLES``) up to the end of its paragraph. ``feed``
+    returns the text that is safe to show; only a possible partial token
+    and a run of whitespace are held back, so every character is scanned
+    a bounded number of times. The output has no leading or trailing
+    whitespace and no more than one blank line in a row.
+    """
+
+    def __init__(self):
+        self._pending = ""
+        self._state = TEXT
+        # State to go back to when a think block ends, and for a preamble,
+        # the newline before the block that may still end it
+        self._after_think = TEXT
+        self._carry = ""
+        self._whitespace = ""
+        self._started = False
+
+    def feed(self, chunk: str) -> str:
+        """Take the next chunk and return the text ready to show"""
+        text = self._pending + chunk
+        self._pending = ""
+        visible = []
+        while text:
+            if self._state == TEXT:
+                match = _START.search(text)
+                if match is None:
+                    keep = _partial_suffix(text, _START_TOKENS)
+                    visible.append(text[:len(text) - keep])
+                    self._pending = text[len(text) - keep:]
+                    break
+                visible.append(text[:match.start()])
+                if match.group().lower() == THINK_OPEN:
+                    self._state, self._after_think = THINK, TEXT
+                else:
+                    self._state = PREAMBLE
+                text = text[match.end():]
+
+            elif self._state == THINK:
+                match = _THINK_CLOSE.search(text)
+                if match is None:
+                    keep = _partial_suffix(text, (THINK_CLOSE,))
+                    self._pending = text[len(text) - keep:]
+                    break
+                self._state = self._after_think
+                text = self._carry + text[match.end():]
+                self._carry = ""
+
+            else:
+                end = _PREAMBLE_END.search(text)
+                think = _THINK_OPEN.search(text, 0, end.start() if end else len(text))
+                if think is not None:
+                    self._state, self._after_think = THINK, PREAMBLE
+                    self._carry = "\n" if text[:think.start()].endswith("\n") else ""
+                    text = text[think.end():]
+                elif end is not None:
+                    self._state = TEXT
+                    text = text[end.start():]
+                else:
+                    # Keep what may start a think tag, and a newline before it that may end the preamble
+                    keep = _partial_suffix(text, (THINK_OPEN,))
+                    if text[:len(text) - keep].endswith("\n"):
+                        keep += 1
+                    self._pending = text[len(text) - keep:]
+                    break
+        return self._emit("".join(visible))
+
+    def flush(self) -> str:
+        """Return what is left once the stream has ended"""
+        # An unfinished token in plain text is shown; unclosed thinking is not
+        tail = self._pending if self._state == TEXT else ""
+        self._pending = ""
+        return self._emit(tail, final=True)
+
+    def _emit(self, text: str, final: bool = False) -> str:
+        """Hold back trailing whitespace and collapse blank-line runs"""
+        text = self._whitespace + text
+        if not self._started:
+            text = text.lstrip()
+        stripped = text.rstrip()
+        self._whitespace = "" if final else text[len(stripped):]
+        if stripped:
+            self._started = True
+        return _BLANK_RUN.sub("\n\n", stripped)
+
+
+def clean_response(content: str) -> str:
+    """Strip thinking from a complete response"""
+    think_filter = ThinkFilter()
+    return think_filter.feed(content) + think_filter.flush()
+
+
+def filter_stream(chunks: Iterable[str]) -> Iterator[str]:
+    """Yield the visible text of a stream of response chunks"""
+    think_filter = ThinkFilter()
+    for chunk in chunks:
+        visible = think_filter.feed(chunk)
+        if visible:
+            yield visible
+    tail = think_filter.flush()
+    if tail:
+        yield tail
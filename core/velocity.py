@@ -0,0 +1,110 @@
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# Sprints averaged by the rolling mean
+ROLLING_WINDOW = 3
+
+# Weight of the newest sprint in the exponentially weighted mean
+EWMA_ALPHA = 0.5
+
+# A fitted change smaller than this share of the mean counts as Stable
+TREND_THRESHOLD = 0.1
+
+
+class VelocitySeries:
+    """Completed-sprint points held as arrays, oldest sprint first"""
+
+    def __init__(self, names: List[str], completed: Sequence[float], planned: Sequence[float]):
+        self.names = names
+        self.completed = np.asarray(completed, dtype=float)
+        self.planned = np.asarray(planned, dtype=float)
+
+    @classmethod
+    def from_sprints(cls, sprints: List[Dict]) -> "VelocitySeries":
+        """Load the completed sprints from a list of sprint dicts, ordered by end date"""
+        completed = sorted((s for s in sprints if s.get('status') == 'Completed'),
+                           key=lambda s: s['end_date'])
+        return cls(
+            [s['name'] for s in completed],
+            [s.get('completed_points', 0) for s in completed],
+            [s.get('total_points', 0) for s in completed]
+        )
+
+    def __len__(self) -> int:
+        return len(self.completed)
+
+    def stats(self, window: int = ROLLING_WINDOW, alpha: float = EWMA_ALPHA) -> Dict:
+        """Get every velocity statistic for the series"""
+        return analyze_velocity(self.completed, window, alpha)
+
+
+def rolling_mean(values: np.ndarray, window: int = ROLLING_WINDOW) -> np.ndarray:
+    """Mean of each value and the ``window - 1`` before it (fewer at the start)"""
+    sums = np.concatenate(([0.0], np.cumsum(values)))
+    ends = np.arange(1, len(values) + 1)
+    starts = np.maximum(0, ends - window)
+    return (sums[ends] - sums[starts]) / (ends - starts)
+
+
+def ewma(values: np.ndarray, alpha: float = EWMA_ALPHA) -> np.ndarray:
+    """Exponentially weighted mean at each point, newest values weighted most"""
+    n = len(values)
+    # lags[t, i] = t - i; weights are zero for future values (i > t)
+    lags = np.subtract.outer(np.arange(n), np.arange(n))
+    weights = np.where(lags >= 0, (1 - alpha) ** np.maximum(lags, 0), 0.0)
+    return weights @ values / weights.sum(axis=1)
+
+
+def trend_label(slope: float, mean: float, count: int) -> str:
+    """Classify a fitted slope by the change it implies across the series"""
+    if count < 2:
+        return "Insufficient data"
+    if mean == 0:
+        return "Stable" if slope == 0 else ("Improving" if slope > 0 else "Declining")
+    change = slope * (count - 1) / abs(mean)
+    if change > TREND_THRESHOLD:
+        return "Improving"
+    if change < -TREND_THRESHOLD:
+        return "Declining"
+    return "Stable"
+
+
+def analyze_velocity(velocities: Sequence[float], window: int = ROLLING_WINDOW,
+                     alpha: float = EWMA_ALPHA) -> Dict:
+    """Compute velocity statistics in one pass over an array of sprint points.
+
+    Returns the mean, sample standard deviation, min/max, percentiles,
+    rolling mean and EWMA series, and a linear-regression slope with its
+    trend label.
+    """
+    values = np.asarray(velocities, dtype=float)
+    count = len(values)
+    if count == 0:
+        return {
+            "count": 0, "mean": 0.0, "std": 0.0, "min": 0.0, "max": 0.0,
+            "p10": 0.0, "p50": 0.0, "p90": 0.0, "recent_mean": 0.0,
+            "rolling_mean": [], "ewma": [], "slope": 0.0,
+            "trend": "Insufficient data"
+        }
+
+    mean = float(values.mean())
+    slope = float(np.polyfit(np.arange(count), values, 1)[0]) if count >= 2 else 0.0
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    rolling = rolling_mean(values, window)
+
+    return {
+        "count": count,
+        "mean": mean,
+        "std": float(values.std(ddof=1)) if count >= 2 else 0.0,
+        "min": float(values.min()),
+        "max": float(values.max()),
+        "p10": float(p10),
+        "p50": float(p50),
+        "p90": float(p90),
+        "recent_mean": float(rolling[-1]),
+        "rolling_mean": rolling.tolist(),
+        "ewma": ewma(values, alpha).tolist(),
+        "slope": slope,
+        "trend": trend_label(slope, mean, count)
+    }
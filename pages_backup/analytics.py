@@ -2,9 +2,11 @@ import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
 import pandas as pd
-from datetime import datetime, timedelta
 import json
 
+from core.forecast import forecast_completion
+from core.velocity import VelocitySeries
+
 def show_analytics():
     """Advanced analytics dashboard for sprint and team performance"""
     
@@ -369,30 +371,15 @@ def show_velocity_tracking():
     
     st.markdown("### 🎯 VELOCITY TRACKING DASHBOARD")
     
-    all_sprints = st.session_state.data_store.get_all_sprints()
-    completed_sprints = [s for s in all_sprints if s.get('status') == 'Completed']
+    series = VelocitySeries.from_sprints(st.session_state.data_store.get_all_sprints())
     
-    if len(completed_sprints) < 2:
+    if len(series) < 2:
         st.info("Need at least 2 completed sprints for velocity analysis.")
         return
     
-    # Calculate velocity for each sprint
-    velocity_data = []
-    for sprint in completed_sprints:
-        velocity_data.append({
-            'Sprint': sprint['name'],
-            'Planned Points': sprint.get('total_points', 0),
-            'Completed Points': sprint.get('completed_points', 0),
-            'End Date': sprint['end_date'],
-            'Velocity': sprint.get('completed_points', 0)
-        })
-    
-    # Sort by end date
-    velocity_data.sort(key=lambda x: x['End Date'])
-    
     # Velocity metrics
-    velocities = [data['Velocity'] for data in velocity_data]
-    avg_velocity = sum(velocities) / len(velocities)
+    stats = series.stats()
+    avg_velocity = stats['mean']
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -400,21 +387,15 @@ def show_velocity_tracking():
         st.metric("Average Velocity", f"{avg_velocity:.1f} pts")
     
     with col2:
-        if len(velocities) >= 2:
-            trend = "↗️" if velocities[-1] > velocities[-2] else "↘️" if velocities[-1] < velocities[-2] else "→"
-            st.metric("Trend", trend)
-        else:
-            st.metric("Trend", "—")
+        trend = {"Improving": "↗️", "Declining": "↘️"}.get(stats['trend'], "→")
+        st.metric("Trend", trend, f"{stats['slope']:+.1f} pts/sprint")
     
     with col3:
-        min_velocity = min(velocities)
-        max_velocity = max(velocities)
-        st.metric("Velocity Range", f"{min_velocity}-{max_velocity}")
+        st.metric("Velocity Range", f"{stats['min']:g}-{stats['max']:g}")
     
     with col4:
-        if len(velocities) >= 3:
-            recent_avg = sum(velocities[-3:]) / 3
-            st.metric("Recent Avg (3 sprints)", f"{recent_avg:.1f}")
+        if len(series) >= 3:
+            st.metric("Recent Avg (3 sprints)", f"{stats['recent_mean']:.1f}")
         else:
             st.metric("Recent Avg", f"{avg_velocity:.1f}")
     
@@ -425,8 +406,8 @@ def show_velocity_tracking():
     
     # Actual velocity
     fig_velocity.add_trace(go.Scatter(
-        x=[data['Sprint'] for data in velocity_data],
-        y=[data['Velocity'] for data in velocity_data],
+        x=series.names,
+        y=series.completed,
         mode='lines+markers',
         name='Actual Velocity',
         line=dict(color='#00ff88', width=3),
@@ -435,13 +416,22 @@ def show_velocity_tracking():
     
     # Average line
     fig_velocity.add_trace(go.Scatter(
-        x=[data['Sprint'] for data in velocity_data],
-        y=[avg_velocity] * len(velocity_data),
+        x=series.names,
+        y=[avg_velocity] * len(series),
         mode='lines',
         name=f'Average ({avg_velocity:.1f})',
         line=dict(color='#ffa726', dash='dash', width=2)
     ))
     
+    # Exponentially weighted average, following recent sprints more closely
+    fig_velocity.add_trace(go.Scatter(
+        x=series.names,
+        y=stats['ewma'],
+        mode='lines',
+        name='Weighted Average',
+        line=dict(color='#00d4ff', dash='dot', width=2)
+    ))
+    
     fig_velocity.update_layout(
         title="Team Velocity Over Time",
         xaxis_title="Sprint",
@@ -461,15 +451,15 @@ def show_velocity_tracking():
     
     fig_comparison.add_trace(go.Bar(
         name='Planned Points',
-        x=[data['Sprint'] for data in velocity_data],
-        y=[data['Planned Points'] for data in velocity_data],
+        x=series.names,
+        y=series.planned,
         marker_color='#3498db'
     ))
     
     fig_comparison.add_trace(go.Bar(
         name='Delivered Points',
-        x=[data['Sprint'] for data in velocity_data],
-        y=[data['Completed Points'] for data in velocity_data],
+        x=series.names,
+        y=series.completed,
         marker_color='#27ae60'
     ))
     
@@ -488,11 +478,9 @@ def show_velocity_tracking():
     # Velocity predictability
     st.markdown("### 🔮 VELOCITY PREDICTABILITY")
     
-    if len(velocities) >= 3:
-        # Calculate standard deviation
-        import statistics
-        velocity_std = statistics.stdev(velocities)
-        predictability_score = max(0, 100 - (velocity_std / avg_velocity * 100))
+    if len(series) >= 3:
+        velocity_std = stats['std']
+        predictability_score = max(0, 100 - (velocity_std / avg_velocity * 100)) if avg_velocity else 0
         
         col1, col2 = st.columns(2)
         
@@ -692,16 +680,24 @@ def generate_release_prediction(backlog_stories):
     
     # Get velocity data
     velocity_data = st.session_state.data_store.get_velocity_history()
-    if velocity_data:
-        avg_velocity = sum(v['completed_points'] for v in velocity_data) / len(velocity_data)
-    else:
-        avg_velocity = 20  # Default assumption
+    velocities = [v['completed_points'] for v in velocity_data] or [20]  # Default assumption
+    avg_velocity = sum(velocities) / len(velocities)
     
-    # Calculate sprints needed
-    sprints_needed = (total_points / avg_velocity) if avg_velocity > 0 else 0
-    weeks_needed = sprints_needed * 2  # Assuming 2-week sprints
+    # Resample past sprints to get a spread of completion dates (2-week sprints)
+    forecast = forecast_completion(total_points, velocities, sprint_weeks=2)
+    if not forecast:
+        return """
+    ## 📅 Release Timeline Prediction
     
-    estimated_date = datetime.now() + timedelta(weeks=weeks_needed)
+    No completed sprint has delivered any points yet, so there is no velocity to forecast from.
+    """
+    
+    sprints_needed = forecast['p50_sprints']
+    weeks_needed = sprints_needed * 2
+    
+    def likely_by(p):
+        date = forecast[f'p{p}_date'].strftime('%Y-%m-%d')
+        return f"{date} ({forecast[f'p{p}_sprints']} sprints)"
     
     return f"""
     ## 📅 Release Timeline Prediction
@@ -713,10 +709,15 @@ def generate_release_prediction(backlog_stories):
     
     **Velocity Analysis:**
     - Average Team Velocity: {avg_velocity:.1f} points/sprint
-    - Sprints Required: {sprints_needed:.1f}
+    - Sprints Required (median): {sprints_needed}
     - Estimated Duration: {weeks_needed:.0f} weeks
     
-    **Predicted Release Date:** {estimated_date.strftime('%Y-%m-%d')}
+    **Predicted Release Date:** {forecast['p50_date'].strftime('%Y-%m-%d')}
+    
+    **Monte Carlo Forecast ({forecast['trials']:,} simulated futures):**
+    - 50% likely by: {likely_by(50)}
+    - 85% likely by: {likely_by(85)}
+    - 95% likely by: {likely_by(95)}
     
     ### Confidence Factors:
     - {"High" if len(velocity_data) >= 3 else "Medium" if len(velocity_data) >= 1 else "Low"} confidence based on velocity history
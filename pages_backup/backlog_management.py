@@ -38,15 +38,11 @@ def show_product_backlog():
     with col4:
         view_mode = st.selectbox("View Mode", ["Card View", "Table View"])
     
-    # Get and filter stories
-    all_stories = st.session_state.data_store.get_all_stories()
-    
-    # Apply filters
-    filtered_stories = all_stories
-    if status_filter != "All":
-        filtered_stories = [s for s in filtered_stories if s.get('status') == status_filter]
-    if priority_filter != "All":
-        filtered_stories = [s for s in filtered_stories if s.get('priority') == priority_filter]
+    # Get filtered stories from the store's secondary indexes
+    filtered_stories = st.session_state.data_store.query_stories(
+        status=status_filter if status_filter != "All" else None,
+        priority=priority_filter if priority_filter != "All" else None
+    )
     
     # Sort stories
     if sort_by == "Priority":
@@ -202,27 +198,28 @@ def show_table_view(stories):
     
     # Apply changes
     if st.button("💾 Save Changes"):
-        for index, row in edited_df.iterrows():
-            story_id = None
-            # Find the full story ID
-            for story in stories:
-                if story['id'].startswith(row['ID']):
-                    story_id = story['id']
-                    break
-            
-            if story_id:
-                story = st.session_state.data_store.get_story(story_id)
-                if story:
-                    story['priority'] = row['Priority']
-                    story['status'] = row['Status']
-                    if row['Points'] != 'Not estimated':
-                        story['story_points'] = float(row['Points'])
-                    story['assignee'] = row['Assignee'] if row['Assignee'] != 'Unassigned' else None
-                    
-                    st.session_state.data_store.update_story(story_id, story)
+        # Map the shortened IDs shown in the table back to full story IDs
+        story_ids = {story['id'][:8]: story['id'] for story in stories}
+        
+        with st.session_state.data_store.transaction() as txn:
+            for index, row in edited_df.iterrows():
+                story_id = story_ids.get(row['ID'])
+                
+                if story_id:
+                    story = st.session_state.data_store.get_story(story_id)
+                    if story:
+                        story = dict(story)
+                        story['priority'] = row['Priority']
+                        story['status'] = row['Status']
+                        if row['Points'] != 'Not estimated':
+                            story['story_points'] = float(row['Points'])
+                        story['assignee'] = row['Assignee'] if row['Assignee'] != 'Unassigned' else None
+                        
+                        txn.save_story(story)
         
-        st.success("Changes saved successfully!")
-        st.rerun()
+        if txn.committed:
+            st.success("Changes saved successfully!")
+            st.rerun()
 
 def show_story_creation():
     """Story creation form"""
@@ -380,10 +377,7 @@ def show_bulk_operations():
         st.markdown("#### 📊 Bulk Status Update")
         new_status = st.selectbox("New Status", st.session_state.scrum_manager.story_statuses)
         if st.button("📊 Update Status", use_container_width=True):
-            updated_count = 0
-            for story_id in selected_stories:
-                if st.session_state.scrum_manager.update_story_status(story_id, new_status):
-                    updated_count += 1
+            updated_count = st.session_state.scrum_manager.update_stories_status(selected_stories, new_status)
             st.success(f"✅ Updated {updated_count} stories to '{new_status}'")
             st.rerun()
     
@@ -394,17 +388,21 @@ def show_bulk_operations():
             labels_to_add = [label.strip() for label in new_labels.split(',') if label.strip()]
             updated_count = 0
             
-            for story_id in selected_stories:
-                story = st.session_state.data_store.get_story(story_id)
-                if story:
-                    existing_labels = set(story.get('labels', []))
-                    existing_labels.update(labels_to_add)
-                    story['labels'] = list(existing_labels)
-                    story['updated_date'] = datetime.now().isoformat()
-                    
-                    if st.session_state.data_store.update_story(story_id, story):
+            with st.session_state.data_store.transaction() as txn:
+                for story_id in selected_stories:
+                    story = st.session_state.data_store.get_story(story_id)
+                    if story:
+                        story = dict(story)
+                        existing_labels = set(story.get('labels', []))
+                        existing_labels.update(labels_to_add)
+                        story['labels'] = list(existing_labels)
+                        story['updated_date'] = datetime.now().isoformat()
+                        
+                        txn.save_story(story)
                         updated_count += 1
             
+            if not txn.committed:
+                updated_count = 0
             st.success(f"✅ Added labels to {updated_count} stories")
             st.rerun()
     
@@ -1,6 +1,7 @@
 import streamlit as st
 from datetime import datetime, timedelta
 import json
+from utils.helpers import atomic_json_save
 
 def show_daily_standup():
     """Daily standup management interface"""
@@ -328,8 +329,7 @@ def save_standup_data(standup_data):
             existing_standups.append(standup_data)
         
         # Save back to file
-        with open(standups_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_standups, f, indent=2, ensure_ascii=False)
+        atomic_json_save(standups_file, existing_standups)
         
         return True
     except Exception as e:
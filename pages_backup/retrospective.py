@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 import plotly.graph_objects as go
 import plotly.express as px
 import json
+from utils.helpers import atomic_json_save
 
 def show_retrospective():
     """Sprint retrospective interface"""
@@ -496,8 +497,7 @@ def save_retrospective_data(retro_data):
             existing_retros.append(retro_data)
         
         # Save back to file
-        with open(retros_file, 'w', encoding='utf-8') as f:
-            json.dump(existing_retros, f, indent=2, ensure_ascii=False)
+        atomic_json_save(retros_file, existing_retros)
         
         return True
     except Exception as e:
@@ -1,6 +1,7 @@
 import streamlit as st
 from datetime import datetime, timedelta
 from core.scrum_manager import ScrumManager
+from core.simulation import SprintScenario
 import plotly.graph_objects as go
 import plotly.express as px
 
@@ -13,7 +14,7 @@ def show_sprint_planning():
     if not st.session_state.ai_client.check_connection():
         st.warning("⚠️ AI assistance unavailable. Manual planning mode active.")
     
-    tab1, tab2, tab3 = st.tabs(["📋 Plan Sprint", "📊 Sprint Overview", "🎯 Sprint Goals"])
+    tab1, tab2, tab3, tab4 = st.tabs(["📋 Plan Sprint", "📊 Sprint Overview", "🎯 Sprint Goals", "🗺️ Roadmap"])
     
     with tab1:
         show_sprint_creation()
@@ -23,6 +24,9 @@ def show_sprint_planning():
     
     with tab3:
         show_sprint_goals()
+    
+    with tab4:
+        show_roadmap()
 
 def show_sprint_creation():
     """Sprint creation and story selection interface"""
@@ -88,11 +92,19 @@ def show_sprint_creation():
                                          f"({next(s.get('story_points', 'Not estimated') for s in available_stories if s['id'] == x)} pts)"
                 )
                 
+                # Warn about unfinished dependencies that would stay outside the sprint
+                graph = st.session_state.data_store.get_dependency_graph()
+                planned_ids = set(current_sprint.get('stories', [])) | set(selected_stories)
+                for story_id in selected_stories:
+                    missing = [dep for dep in graph.blocked_by(story_id) if dep not in planned_ids]
+                    if missing:
+                        st.warning(f"⛓️ {story_id} depends on {len(missing)} unfinished "
+                                   f"stories not in this sprint: {', '.join(missing)}")
+                
                 if st.button("➕ Add Selected Stories"):
-                    added_count = 0
-                    for story_id in selected_stories:
-                        if st.session_state.scrum_manager.add_story_to_sprint(current_sprint['id'], story_id):
-                            added_count += 1
+                    added_count = st.session_state.scrum_manager.add_stories_to_sprint(
+                        current_sprint['id'], selected_stories
+                    )
                     
                     if added_count > 0:
                         st.success(f"✅ Added {added_count} stories to sprint")
@@ -125,6 +137,29 @@ def show_sprint_creation():
             else:
                 st.error("AI service unavailable")
         
+        # Deterministic capacity-based plan
+        current_sprint = st.session_state.data_store.get_current_sprint()
+        if current_sprint and st.button("🧮 Auto-Plan to Capacity", use_container_width=True):
+            st.session_state.sprint_auto_plan = st.session_state.scrum_manager.plan_sprint(current_sprint['id'])
+        
+        plan = st.session_state.get('sprint_auto_plan')
+        if current_sprint and plan and plan.get('sprint_id') == current_sprint['id']:
+            st.metric("Planned Points", f"{plan['total_points']:g} / {plan['capacity']:g} pts")
+            for story_id in plan['story_ids']:
+                story = st.session_state.data_store.get_story(story_id)
+                if story:
+                    st.write(f"• {story['title']} ({story.get('story_points')} pts, {story.get('priority', 'Medium')})")
+            if plan['unplannable']:
+                st.caption(f"{plan['unplannable']} stories skipped: unestimated or blocked by unestimated/circular dependencies")
+            
+            if plan['story_ids'] and st.button("✅ Add Planned Stories", use_container_width=True):
+                added_count = st.session_state.scrum_manager.add_stories_to_sprint(
+                    current_sprint['id'], plan['story_ids']
+                )
+                del st.session_state.sprint_auto_plan
+                st.success(f"✅ Added {added_count} stories to sprint")
+                st.rerun()
+        
         # Quick actions
         st.markdown("### ⚡ QUICK ACTIONS")
         
@@ -251,6 +286,123 @@ def show_sprint_overview():
                     <small>Status: {story['status']} | Points: {story.get('story_points', 'Not estimated')}</small>
                 </div>
                 """, unsafe_allow_html=True)
+    
+    show_what_if(current_sprint)
+
+def show_what_if(current_sprint):
+    """Try scope, capacity and team changes on the current sprint without saving them"""
+    
+    st.markdown("### 🧪 WHAT-IF SIMULATION")
+    
+    scenario = SprintScenario(st.session_state.data_store, current_sprint['id'])
+    in_sprint = set(current_sprint.get('stories', []))
+    candidates = [s for s in st.session_state.data_store.get_all_stories()
+                  if s['id'] not in in_sprint and s.get('status') != 'Done']
+    titles = {s['id']: s['title'] for s in candidates}
+    titles.update({s['id']: s['title'] for s in scenario.stories()})
+    
+    # Measure deltas against the unchanged scenario, so estimate changes since
+    # the stories were added do not show up as scope changes
+    base_points = scenario.progress()['total_points']
+    base_capacity = int(current_sprint.get('capacity', 40))
+    base_team = scenario.base_team_size()
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        # Slider ranges always include the current values
+        capacity = st.slider("Capacity (points)", min_value=0, max_value=max(200, base_capacity * 2),
+                             value=base_capacity, key="what_if_capacity")
+        team_size = st.slider("Team members", min_value=1, max_value=max(20, base_team * 2),
+                              value=base_team, key="what_if_team")
+    with col2:
+        to_add = st.multiselect("Add stories", options=list(titles.keys() - in_sprint),
+                                format_func=lambda x: titles[x], key="what_if_add")
+        to_remove = st.multiselect("Remove stories", options=list(in_sprint & titles.keys()),
+                                   format_func=lambda x: titles[x], key="what_if_remove")
+    
+    if team_size != base_team:
+        scenario.set_team_size(team_size)
+    if capacity != base_capacity:
+        scenario.set_capacity(capacity)
+    for story_id in to_add:
+        scenario.add_story(story_id)
+    for story_id in to_remove:
+        scenario.remove_story(story_id)
+    
+    progress = scenario.progress()
+    forecast = scenario.forecast()
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Scope", f"{progress['total_points']:g} pts",
+                  f"{progress['total_points'] - base_points:+g}")
+    with col2:
+        st.metric("Capacity", f"{progress['capacity']:.0f} pts")
+    with col3:
+        st.metric("Remaining", f"{progress['remaining_points']:g} pts")
+    with col4:
+        st.metric("On-time Chance", f"{forecast['on_time_probability'] * 100:.0f}%")
+    
+    if progress['over_capacity']:
+        st.warning("⚠️ Scope exceeds capacity in this scenario")
+    if 'p85_date' in forecast:
+        st.caption(f"Finish dates: P50 {forecast['p50_date'].strftime('%Y-%m-%d')}, "
+                   f"P85 {forecast['p85_date'].strftime('%Y-%m-%d')}, "
+                   f"P95 {forecast['p95_date'].strftime('%Y-%m-%d')}")
+    
+    burndown = scenario.burndown()
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=[p['date'] for p in burndown['ideal_line']],
+        y=[p['ideal_remaining'] for p in burndown['ideal_line']],
+        mode='lines', name='Ideal', line=dict(color='#888', dash='dash')
+    ))
+    fig.add_trace(go.Scatter(
+        x=[p['date'] for p in burndown['actual_line']],
+        y=[p['actual_remaining'] for p in burndown['actual_line']],
+        mode='lines+markers', name='Actual', line=dict(color='#00ff88')
+    ))
+    fig.add_trace(go.Scatter(
+        x=[p['date'] for p in burndown['projected_line']],
+        y=[p['projected_remaining'] for p in burndown['projected_line']],
+        mode='lines', name='Scenario', line=dict(color='#00d4ff', dash='dot')
+    ))
+    fig.update_layout(
+        title="Scenario Burndown",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='white')
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+def show_roadmap():
+    """Backlog spread across upcoming sprints by priority, dependencies and capacity"""
+    
+    st.markdown("### 🗺️ BACKLOG ROADMAP")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        sprint_count = st.slider("Sprints to plan", min_value=1, max_value=26, value=6)
+    with col2:
+        capacity = st.number_input("Capacity for projected sprints (points)", min_value=1, max_value=500, value=40)
+    
+    roadmap = st.session_state.scrum_manager.plan_roadmap(sprint_count, capacity)
+    
+    for entry in roadmap['sprints']:
+        sprint = entry['sprint']
+        label = "projected" if sprint.get('projected') else sprint.get('status', 'Planning')
+        with st.expander(f"{sprint['name']} ({sprint['start_date']} → {sprint['end_date']}, {label}) — "
+                         f"{entry['planned_points']:g}/{entry['capacity']:g} pts"):
+            for story_id in entry['story_ids']:
+                story = st.session_state.data_store.get_story(story_id)
+                if story:
+                    st.write(f"• {story['title']} ({story.get('story_points')} pts, {story.get('priority', 'Medium')})")
+            if not entry['story_ids']:
+                st.caption("Nothing allocated")
+    
+    if roadmap['unscheduled']:
+        st.warning(f"{len(roadmap['unscheduled'])} stories not scheduled: unestimated, "
+                   f"over capacity, or waiting on such stories")
 
 def show_sprint_goals():
     """Sprint goals management"""
@@ -4,11 +4,22 @@ Utility helper functions for NeuralSprint application
 
 import streamlit as st
 import json
+import os
 import re
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import uuid
 
+# Seconds between fsyncs for atomic writes; 0 fsyncs every write. Batching
+# trades durability of the last few writes for throughput, but a reader
+# still never sees a half-written file.
+FSYNC_INTERVAL = float(os.getenv("NEURALSPRINT_FSYNC_INTERVAL", "0"))
+
+_fsync_lock = threading.Lock()
+_last_fsync = 0.0
+
 def generate_unique_id(prefix: str = "") -> str:
     """Generate a unique identifier with optional prefix"""
     unique_id = str(uuid.uuid4())[:8]
@@ -205,11 +216,74 @@ def safe_json_load(file_path: str, default: Any = None) -> Any:
     except (FileNotFoundError, json.JSONDecodeError, UnicodeDecodeError):
         return default if default is not None else {}
 
+def _fsync_due() -> bool:
+    """Decide whether this write should fsync under the batching interval"""
+    global _last_fsync
+    if FSYNC_INTERVAL <= 0:
+        return True
+    with _fsync_lock:
+        now = time.monotonic()
+        if now - _last_fsync >= FSYNC_INTERVAL:
+            _last_fsync = now
+            return True
+        return False
+
+def _file_mode(file_path: str) -> Optional[int]:
+    """Permission bits a rewrite of file_path should keep, or None for a new file"""
+    try:
+        return os.stat(file_path).st_mode & 0o7777
+    except OSError:
+        return None
+
+def atomic_write_bytes(file_path: str, payload: bytes, fsync: Optional[bool] = None) -> None:
+    """Atomically replace a file with payload via a temp file and os.replace.
+
+    Readers see either the old or the new contents, never a truncated file.
+    ``fsync`` forces or skips the flush to disk; by default it follows
+    NEURALSPRINT_FSYNC_INTERVAL. Raises OSError on failure.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    do_fsync = _fsync_due() if fsync is None else fsync
+    
+    # Created as open() would create the file itself, so a new file gets the
+    # process umask; os.replace keeps the temp file's mode
+    temp_path = os.path.join(directory, f".{os.path.basename(file_path)}.{uuid.uuid4().hex}.tmp")
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+    try:
+        mode = _file_mode(file_path)
+        if mode is not None and hasattr(os, 'fchmod'):
+            os.fchmod(fd, mode)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            if do_fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(temp_path, file_path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    
+    if do_fsync and hasattr(os, 'O_DIRECTORY'):
+        # Persist the rename itself (POSIX only)
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+def atomic_json_save(file_path: str, data: Any, indent: Optional[int] = 2,
+                     fsync: Optional[bool] = None, default: Any = None) -> None:
+    """Atomically write data as JSON. Raises on failure."""
+    payload = json.dumps(data, indent=indent, ensure_ascii=False, default=default)
+    atomic_write_bytes(file_path, payload.encode('utf-8'), fsync=fsync)
+
 def safe_json_save(file_path: str, data: Any) -> bool:
     """Safely save data to JSON file with error handling"""
     try:
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+        atomic_json_save(file_path, data, default=str)
         return True
     except Exception as e:
         st.error(f"Error saving file {file_path}: {str(e)}")
@@ -231,32 +305,8 @@ def extract_keywords(text: str, min_length: int = 3) -> List[str]:
 
 def calculate_velocity_trend(velocities: List[float]) -> str:
     """Calculate velocity trend from historical data"""
-    if len(velocities) < 2:
-        return "Insufficient data"
-    
-    if len(velocities) < 4:
-        # Simple comparison for small datasets
-        recent = velocities[-1]
-        previous = velocities[-2]
-        if recent > previous * 1.1:
-            return "Improving"
-        elif recent < previous * 0.9:
-            return "Declining"
-        else:
-            return "Stable"
-    
-    # More sophisticated trend analysis for larger datasets
-    recent_avg = sum(velocities[-3:]) / 3
-    older_avg = sum(velocities[:-3]) / len(velocities[:-3])
-    
-    difference_pct = (recent_avg - older_avg) / older_avg * 100
-    
-    if difference_pct > 10:
-        return "Improving"
-    elif difference_pct < -10:
-        return "Declining"
-    else:
-        return "Stable"
+    from core.velocity import analyze_velocity
+    return analyze_velocity(velocities)['trend']
 
 def format_duration(hours: float) -> str:
     """Format duration in hours to human readable format"""